@@ -13,10 +13,14 @@ Usage:
 
 import os
 import sys
+import json
 import shutil
+import hashlib
 import platform
+import importlib
 import subprocess
 import argparse
+import functools
 from pathlib import Path
 
 # ============================================================================
@@ -39,7 +43,63 @@ HIDDEN_IMPORTS = [
     'soundfile',
 ]
 
+# Platform-specific hidden imports, keyed by get_platform() result.
+# Only the current platform's entries go into the spec so other
+# platforms' backends never inflate the bundle.
+PLATFORM_HIDDEN_IMPORTS = {
+    'windows': [
+        'pynput.keyboard._win32',
+        'pynput.mouse._win32',
+        'dxcam',
+        'inputs',
+    ],
+    'macos': [
+        'pynput.keyboard._darwin',
+        'pynput.mouse._darwin',
+    ],
+    'linux': [
+        'pynput.keyboard._xorg',
+        'pynput.mouse._xorg',
+    ],
+}
+
+# Feature each optional module belongs to; modules not listed here are
+# always bundled. Consulted against the --features selection.
+MODULE_FEATURES = {
+    'sounddevice': 'audio',
+    'soundfile': 'audio',
+    'dxcam': 'video',
+    'pynput.keyboard._win32': 'input',
+    'pynput.mouse._win32': 'input',
+    'pynput.keyboard._darwin': 'input',
+    'pynput.mouse._darwin': 'input',
+    'pynput.keyboard._xorg': 'input',
+    'pynput.mouse._xorg': 'input',
+    'inputs': 'input',
+}
+
+DEFAULT_FEATURES = frozenset(['video', 'audio', 'input'])
+
+# Runtime hook bundled into the frozen app (see write_runtime_hook)
+RUNTIME_HOOK_NAME = 'runtime_hook_no_site.py'
+
+RUNTIME_HOOK_CONTENT = '''\
+# Generated by build_executable.py - runs before the app's own imports.
+# A frozen app gains nothing from writing __pycache__ under its extract
+# dir or scanning user site-packages; both just slow cold start.
+import os
+import sys
+
+os.environ.setdefault('PYTHONDONTWRITEBYTECODE', '1')
+os.environ.setdefault('PYTHONNOUSERSITE', '1')
+sys.dont_write_bytecode = True
+'''
+
+# Cache for the traced module manifest (see discover_used_modules)
+USED_MODULES_CACHE = os.path.join('.build_cache', 'used_modules.json')
+
 # Modules to exclude (reduce size and avoid missing module errors)
+# Merged with the computed exclude set when a traced manifest is available.
 EXCLUDES = [
     'matplotlib',
     'scipy',
@@ -54,12 +114,46 @@ EXCLUDES = [
     'pkg_resources.py2_warn',
 ]
 
+# Shared libraries that main.py never touches but PyInstaller picks up
+# transitively. Filtered out of a.binaries in the generated spec.
+BINARY_EXCLUDES = [
+    'libicudata.so.66',
+    'libicuuc.so.66',
+    'librsvg-2.so.2',
+    'Qt5Qml',
+    'Qt6Qml',
+    'tcl86t.dll',
+    'tk86t.dll',
+]
+
+# Binaries UPX must not touch: already-compressed or load-address-sensitive
+# DLLs that UPX either can't shrink or actively breaks
+UPX_EXCLUDE = [
+    'vcruntime140.dll',
+    'python3*.dll',
+    'Qt6*.dll',
+    'Qt5*.dll',
+    'ffmpeg.exe',
+    'libcrypto-*.dll',
+    'libssl-*.dll',
+    'mkl_*.dll',
+]
+
+# Data directories (prefix match) to drop from a.datas in the generated spec
+DATA_PREFIX_EXCLUDES = [
+    'tcl/',
+    'tk/',
+    'PySide6/translations/',
+    'PySide6/Qt/qml/',
+]
+
 # ============================================================================
 # Build Functions
 # ============================================================================
 
+@functools.lru_cache(maxsize=1)
 def get_platform():
-    """Get current platform name."""
+    """Get current platform name (cached - called from several build steps)."""
     system = platform.system().lower()
     if system == 'darwin':
         return 'macos'
@@ -69,7 +163,6 @@ def get_platform():
 def check_pyinstaller():
     """Check if PyInstaller is installed."""
     try:
-        import importlib
         pyinstaller = importlib.import_module("PyInstaller")
         version = getattr(pyinstaller, "__version__", "unknown")
         print("[OK] PyInstaller {} found".format(version))
@@ -80,6 +173,126 @@ def check_pyinstaller():
         return False
 
 
+def compute_build_key():
+    """
+    Compute a short content hash over the build inputs (sources, config,
+    and the installed package set). Used to key PyInstaller's workpath so
+    the expensive Analysis graph is reused when nothing changed.
+
+    Returns:
+        16-character hex digest, or None if hashing failed
+    """
+    hasher = hashlib.blake2b()
+    for input_path in ['main.py', 'config.yaml', 'requirements.txt']:
+        if os.path.isfile(input_path):
+            with open(input_path, 'rb') as f:
+                hasher.update(f.read())
+
+    try:
+        frozen = subprocess.check_output(
+            [sys.executable, '-m', 'pip', 'freeze'], timeout=60
+        )
+        hasher.update(frozen)
+    except (OSError, subprocess.SubprocessError):
+        # Without the environment snapshot the cache key is unreliable
+        return None
+
+    return hasher.hexdigest()[:16]
+
+
+def discover_used_modules(force=False):
+    """
+    Discover the modules main.py actually uses by running it once under trace.
+
+    Runs `python -m trace --listfuncs main.py --smoke-test` (a short synthetic
+    recording session), collects the top-level module names that were touched,
+    and caches them in .build_cache/used_modules.json so normal builds don't
+    pay for the traced run.
+
+    Args:
+        force: Re-record the trace even if a cached manifest exists
+
+    Returns:
+        Set of top-level module names, or None if tracing failed
+    """
+    if not force and os.path.isfile(USED_MODULES_CACHE):
+        try:
+            with open(USED_MODULES_CACHE, 'r') as f:
+                used = set(json.load(f))
+            print("[OK] Using cached module manifest ({} modules)".format(len(used)))
+            return used
+        except (OSError, ValueError):
+            print("[WARN] Module manifest cache unreadable, re-recording")
+
+    print("[INFO] Recording module trace (this runs a short smoke session)...")
+    try:
+        result = subprocess.run(
+            [sys.executable, '-m', 'trace', '--listfuncs',
+             'main.py', '--smoke-test'],
+            capture_output=True, text=True, timeout=300
+        )
+    except (OSError, subprocess.TimeoutExpired) as e:
+        print("[WARN] Trace run failed ({}), falling back to static imports".format(e))
+        return None
+
+    used = set()
+    for line in result.stdout.splitlines():
+        # trace --listfuncs lines look like:
+        # filename: /path/to/mod.py, modulename: pkg.mod, funcname: fn
+        marker = 'modulename: '
+        idx = line.find(marker)
+        if idx == -1:
+            continue
+        modulename = line[idx + len(marker):].split(',')[0].strip()
+        if modulename:
+            used.add(modulename.split('.')[0])
+
+    if not used:
+        print("[WARN] Trace produced no module list, falling back to static imports")
+        return None
+
+    os.makedirs(os.path.dirname(USED_MODULES_CACHE), exist_ok=True)
+    with open(USED_MODULES_CACHE, 'w') as f:
+        json.dump(sorted(used), f, indent=2)
+    print("[OK] Recorded {} used modules to {}".format(len(used), USED_MODULES_CACHE))
+    return used
+
+
+def compute_excludes(used_modules):
+    """
+    Compute the exclude list: every installed distribution whose top-level
+    module was never touched by the traced run, minus the stdlib.
+
+    Args:
+        used_modules: Set of top-level module names from discover_used_modules
+
+    Returns:
+        Sorted list of module names to exclude (includes manual EXCLUDES)
+    """
+    excludes = set(EXCLUDES)
+    if used_modules:
+        import importlib.metadata
+        stdlib = set(getattr(sys, 'stdlib_module_names', ()))
+
+        # packages_distributions maps importable top-level names to the
+        # distributions providing them, so mismatched pairs like
+        # Pillow->PIL and opencv-python->cv2 are excluded under the name
+        # PyInstaller actually resolves
+        installed = set(importlib.metadata.packages_distributions())
+
+        # Never exclude the declared hidden imports: the lazily loaded
+        # backends (dxcam, inputs, ...) are imported inside functions the
+        # smoke run doesn't reach, so the trace misses them - and
+        # PyInstaller's excludes override hiddenimports
+        hidden = {name.split('.', 1)[0] for name in HIDDEN_IMPORTS}
+        for names in PLATFORM_HIDDEN_IMPORTS.values():
+            hidden |= {name.split('.', 1)[0] for name in names}
+        hidden |= {name.split('.', 1)[0] for name in MODULE_FEATURES}
+
+        excludes |= installed - used_modules - stdlib - hidden
+    return sorted(excludes)
+
+
 def check_ffmpeg():
     """Check if FFmpeg is available for bundling."""
     ffmpeg_dirs = ['ffmpeg_bin', 'tools/ffmpeg', 'vendor/ffmpeg']
@@ -89,95 +302,47 @@ def check_ffmpeg():
             print("[OK] FFmpeg found in {}".format(dir_path))
             return dir_path
     
-    try:
-        result = subprocess.run(['ffmpeg', '-version'], capture_output=True)
-        if result.returncode == 0:
-            print("[OK] System FFmpeg available (not bundled)")
-            return None
-    except FileNotFoundError:
-        pass
-    
+    # A PATH scan is all we need to detect presence - no point paying for
+    # a full ffmpeg -version fork/exec
+    if shutil.which('ffmpeg'):
+        print("[OK] System FFmpeg available (not bundled)")
+        return None
+
     print("[WARN] FFmpeg not found - H.264/H.265 will use fallback codec")
     return None
 
 
-def clean_build():
+def snapshot_root():
+    """
+    Snapshot the project root's entries with one scandir pass so callers
+    can test existence by set membership instead of per-path stat calls.
+    """
+    return {e.name for e in os.scandir('.')}
+
+
+def clean_build(root=None):
     """Clean previous build artifacts."""
+    if root is None:
+        root = snapshot_root()
+
     dirs_to_clean = ['build', 'dist', '__pycache__']
-    
+
     for dir_name in dirs_to_clean:
-        if os.path.exists(dir_name):
+        if dir_name in root:
             print("  Removing {}/".format(dir_name))
             shutil.rmtree(dir_name)
-    
-    import glob
-    for file_path in glob.glob('*.spec'):
-        if 'GameOn.spec' not in file_path:
+
+    for file_path in root:
+        if file_path.endswith('.spec') and file_path != 'GameOn.spec':
             print("  Removing {}".format(file_path))
             os.remove(file_path)
-    
+
     print("[OK] Clean complete")
 
 
-def create_spec_file(onefile=False, ffmpeg_path=None):
-    """Create PyInstaller spec file with all configurations."""
-    
-    plat = get_platform()
-    
-    if plat == 'windows':
-        icon = 'assets/icon.ico' if os.path.exists('assets/icon.ico') else None
-        console = False
-    elif plat == 'macos':
-        icon = 'assets/icon.icns' if os.path.exists('assets/icon.icns') else None
-        console = False
-    else:
-        icon = 'assets/icon.png' if os.path.exists('assets/icon.png') else None
-        console = False
-    
-    datas_str = "[\n"
-    for src, dst in DATA_FILES:
-        if os.path.exists(src):
-            datas_str += "        ('{}', '{}'),\n".format(src, dst)
-    
-    if ffmpeg_path:
-        if plat == 'windows':
-            ffmpeg_exe = os.path.join(ffmpeg_path, 'windows', 'ffmpeg.exe')
-            if os.path.exists(ffmpeg_exe):
-                datas_str += "        ('{}', '.'),\n".format(ffmpeg_exe)
-        elif plat == 'macos':
-            ffmpeg_exe = os.path.join(ffmpeg_path, 'macos', 'ffmpeg')
-            if os.path.exists(ffmpeg_exe):
-                datas_str += "        ('{}', '.'),\n".format(ffmpeg_exe)
-    
-    datas_str += "    ]"
-    
-    # Build hidden imports list - PLATFORM SPECIFIC ONLY
-    hiddenimports_str = "[\n"
-    for imp in HIDDEN_IMPORTS:
-        hiddenimports_str += "        '{}',\n".format(imp)
-    
-    # Add platform-specific pynput backends (ONLY for current platform)
-    if plat == 'windows':
-        hiddenimports_str += "        'pynput.keyboard._win32',\n"
-        hiddenimports_str += "        'pynput.mouse._win32',\n"
-        hiddenimports_str += "        'pyaudiowpatch',\n"
-        hiddenimports_str += "        'dxcam',\n"
-        hiddenimports_str += "        'inputs',\n"
-    elif plat == 'macos':
-        hiddenimports_str += "        'pynput.keyboard._darwin',\n"
-        hiddenimports_str += "        'pynput.mouse._darwin',\n"
-    
-    hiddenimports_str += "    ]"
-    
-    # Build excludes list
-    excludes_str = "[\n"
-    for exc in EXCLUDES:
-        excludes_str += "        '{}',\n".format(exc)
-    excludes_str += "    ]"
-    
-    icon_str = "'{}'".format(icon) if icon else 'None'
-    
-    spec_content = '''# -*- mode: python ; coding: utf-8 -*-
+# Spec-file templates. Filled in once per build by create_spec_file();
+# {placeholders} are pre-rendered Python literals.
+SPEC_HEADER_TEMPLATE = '''# -*- mode: python ; coding: utf-8 -*-
 import sys
 import os
 
@@ -192,20 +357,27 @@ a = Analysis(
     hiddenimports={hiddenimports},
     hookspath=[],
     hooksconfig={{}},
-    runtime_hooks=[],
+    runtime_hooks={runtime_hooks},
     excludes={excludes},
     win_no_prefer_redirects=False,
     win_private_assemblies=False,
     cipher=block_cipher,
     noarchive=False,
+    optimize={optimize},
 )
 
+# Drop shared libs and data trees the app never touches (do it once at
+# build time instead of shipping and unpacking them on every launch)
+_EXCL_BIN = {excl_bin}
+_EXCL_DATA_PREFIX = {excl_data_prefix}
+a.binaries = [b for b in a.binaries if os.path.basename(b[0]) not in _EXCL_BIN]
+a.datas = [d for d in a.datas if not d[0].startswith(_EXCL_DATA_PREFIX)]
+
 pyz = PYZ(a.pure, a.zipped_data, cipher=block_cipher)
 
-'''.format(datas=datas_str, hiddenimports=hiddenimports_str, excludes=excludes_str)
-    
-    if onefile:
-        spec_content += '''exe = EXE(
+'''
+
+SPEC_EXE_ONEFILE_TEMPLATE = '''exe = EXE(
     pyz,
     a.scripts,
     a.binaries,
@@ -216,8 +388,8 @@ pyz = PYZ(a.pure, a.zipped_data, cipher=block_cipher)
     debug=False,
     bootloader_ignore_signals=False,
     strip=False,
-    upx=True,
-    upx_exclude=[],
+    upx={upx},
+    upx_exclude={upx_exclude},
     runtime_tmpdir=None,
     console={console},
     disable_windowed_traceback=False,
@@ -227,9 +399,9 @@ pyz = PYZ(a.pure, a.zipped_data, cipher=block_cipher)
     entitlements_file=None,
     icon={icon},
 )
-'''.format(name=APP_NAME, console=console, icon=icon_str)
-    else:
-        spec_content += '''exe = EXE(
+'''
+
+SPEC_EXE_ONEDIR_TEMPLATE = '''exe = EXE(
     pyz,
     a.scripts,
     [],
@@ -238,7 +410,7 @@ pyz = PYZ(a.pure, a.zipped_data, cipher=block_cipher)
     debug=False,
     bootloader_ignore_signals=False,
     strip=False,
-    upx=True,
+    upx={upx},
     console={console},
     disable_windowed_traceback=False,
     argv_emulation=False,
@@ -254,14 +426,13 @@ coll = COLLECT(
     a.zipfiles,
     a.datas,
     strip=False,
-    upx=True,
-    upx_exclude=[],
+    upx={upx},
+    upx_exclude={upx_exclude},
     name='{name}',
 )
-'''.format(name=APP_NAME, console=console, icon=icon_str)
-    
-    if plat == 'macos' and not onefile:
-        spec_content += '''
+'''
+
+SPEC_BUNDLE_TEMPLATE = '''
 app = BUNDLE(
     coll,
     name='{name}.app',
@@ -277,12 +448,166 @@ app = BUNDLE(
         'NSScreenCaptureDescription': 'GameOn needs screen recording access to capture gameplay.',
     }},
 )
-'''.format(name=APP_NAME, version=VERSION, icon=icon_str)
-    
-    return spec_content
+'''
+
+
+def _spec_list(items):
+    """Render a list of Python literals as an indented spec-file list."""
+    return "[\n" + "".join("        {},\n".format(item) for item in items) + "    ]"
+
 
+def write_runtime_hook():
+    """Write the startup runtime hook next to the spec file."""
+    with open(RUNTIME_HOOK_NAME, 'w') as f:
+        f.write(RUNTIME_HOOK_CONTENT)
+    return RUNTIME_HOOK_NAME
 
-def build_executable(onefile=False, clean=False):
+
+def create_spec_file(onefile=False, ffmpeg_path=None, used_modules=None, optimize=2,
+                     upx=True, features=DEFAULT_FEATURES, root=None):
+    """Create PyInstaller spec file with all configurations."""
+
+    runtime_hooks = [write_runtime_hook()]
+
+    if root is None:
+        root = snapshot_root()
+
+    plat = get_platform()
+    console = False
+
+    # One scandir pass instead of per-icon exists() probes
+    if os.path.isdir('assets'):
+        existing_assets = {e.name for e in os.scandir('assets')}
+    else:
+        existing_assets = set()
+
+    if plat == 'windows':
+        icon_name = 'icon.ico'
+    elif plat == 'macos':
+        icon_name = 'icon.icns'
+    else:
+        icon_name = 'icon.png'
+    icon = 'assets/{}'.format(icon_name) if icon_name in existing_assets else None
+
+    datas = [(src, dst) for src, dst in DATA_FILES if src in root]
+
+    if ffmpeg_path:
+        if plat == 'windows':
+            ffmpeg_exe = os.path.join(ffmpeg_path, 'windows', 'ffmpeg.exe')
+            if os.path.exists(ffmpeg_exe):
+                datas.append((ffmpeg_exe, '.'))
+        elif plat == 'macos':
+            ffmpeg_exe = os.path.join(ffmpeg_path, 'macos', 'ffmpeg')
+            if os.path.exists(ffmpeg_exe):
+                datas.append((ffmpeg_exe, '.'))
+
+    # Build hidden imports list - PLATFORM SPECIFIC ONLY
+    # Prefer the traced manifest (modules actually exercised) over the
+    # static HIDDEN_IMPORTS fallback.
+    hidden_imports = list(sorted(used_modules) if used_modules else HIDDEN_IMPORTS)
+
+    # Add platform-specific backends (ONLY for current platform)
+    hidden_imports += PLATFORM_HIDDEN_IMPORTS.get(plat, [])
+
+    # Drop modules belonging to features this build doesn't ship
+    # (e.g. --features=video,input leaves out the whole audio stack)
+    hidden_imports = [
+        imp for imp in hidden_imports
+        if MODULE_FEATURES.get(imp, None) in features or imp not in MODULE_FEATURES
+    ]
+
+    # repr() the embedded paths so Windows backslashes stay escaped
+    datas_str = _spec_list("({!r}, {!r})".format(src, dst) for src, dst in datas)
+    hiddenimports_str = _spec_list(repr(imp) for imp in hidden_imports)
+
+    # Excludes: everything installed but never traced, plus the manual
+    # EXCLUDES overrides
+    excludes_str = _spec_list(repr(exc) for exc in compute_excludes(used_modules))
+
+    icon_str = repr(icon) if icon else 'None'
+
+    parts = [SPEC_HEADER_TEMPLATE.format(
+        datas=datas_str,
+        hiddenimports=hiddenimports_str,
+        excludes=excludes_str,
+        runtime_hooks=repr(runtime_hooks),
+        optimize=optimize,
+        excl_bin="set({!r})".format(sorted(BINARY_EXCLUDES)),
+        excl_data_prefix=repr(tuple(DATA_PREFIX_EXCLUDES)),
+    )]
+
+    if onefile:
+        parts.append(SPEC_EXE_ONEFILE_TEMPLATE.format(
+            name=APP_NAME, console=console, icon=icon_str,
+            upx=upx, upx_exclude=repr(UPX_EXCLUDE)))
+    else:
+        parts.append(SPEC_EXE_ONEDIR_TEMPLATE.format(
+            name=APP_NAME, console=console, icon=icon_str,
+            upx=upx, upx_exclude=repr(UPX_EXCLUDE)))
+
+    if plat == 'macos' and not onefile:
+        parts.append(SPEC_BUNDLE_TEMPLATE.format(
+            name=APP_NAME, version=VERSION, icon=icon_str))
+
+    return "".join(parts)
+
+
+def write_spec_if_changed(spec_path, spec_content):
+    """
+    Write the spec file only when its content actually changed, so
+    PyInstaller's mtime-based workpath cache survives no-op regenerations.
+    """
+    try:
+        with open(spec_path, 'r') as f:
+            old_content = f.read()
+    except OSError:
+        old_content = None
+
+    if old_content == spec_content:
+        print("[OK] {} unchanged".format(spec_path))
+        return False
+
+    with open(spec_path, 'w') as f:
+        f.write(spec_content)
+    print("[OK] Updated {}".format(spec_path))
+    return True
+
+
+def run_pyinstaller(pyi_args, use_subprocess=False):
+    """
+    Run PyInstaller, in-process by default so we skip a second interpreter
+    startup and hook re-import. Falls back to (or is forced onto) a
+    subprocess with --subprocess for CI isolation.
+
+    Args:
+        pyi_args: Argument list to hand to PyInstaller
+        use_subprocess: Force the subprocess path
+
+    Returns:
+        True if the build succeeded
+    """
+    if not use_subprocess:
+        try:
+            import PyInstaller.__main__ as pyi_main
+        except ImportError:
+            use_subprocess = True
+        else:
+            try:
+                pyi_main.run(pyi_args)
+                return True
+            except SystemExit as e:
+                return not e.code
+
+    try:
+        subprocess.run([sys.executable, '-m', 'PyInstaller'] + pyi_args, check=True)
+        return True
+    except subprocess.CalledProcessError as e:
+        print("[ERROR] PyInstaller exited with code {}".format(e.returncode))
+        return False
+
+
+def build_executable(onefile=False, clean=False, profile_run=False, optimize=2,
+                     upx=True, use_subprocess=False, features=DEFAULT_FEATURES):
     """Build the executable."""
     
     print("")
@@ -298,55 +623,79 @@ def build_executable(onefile=False, clean=False):
         print("")
         print("[INFO] Cleaning previous builds...")
         clean_build()
+
+    # One snapshot serves the remaining existence checks
+    root = snapshot_root()
     
     print("")
     print("[INFO] Checking FFmpeg...")
     ffmpeg_path = check_ffmpeg()
     
+    print("")
+    print("[INFO] Discovering used modules...")
+    used_modules = discover_used_modules(force=profile_run)
+
     print("")
     print("[INFO] Creating spec file...")
-    spec_content = create_spec_file(onefile=onefile, ffmpeg_path=ffmpeg_path)
+    spec_content = create_spec_file(onefile=onefile, ffmpeg_path=ffmpeg_path,
+                                    used_modules=used_modules, optimize=optimize,
+                                    upx=upx, features=features, root=root)
     
     spec_path = 'GameOn.spec'
-    with open(spec_path, 'w') as f:
-        f.write(spec_content)
-    print("[OK] Created {}".format(spec_path))
+    write_spec_if_changed(spec_path, spec_content)
     
     print("")
     print("[INFO] Building executable...")
     print("   This may take a few minutes...")
     print("")
     
-    cmd = ['pyinstaller', '--clean', '--noconfirm', spec_path]
-    
-    try:
-        subprocess.run(cmd, check=True)
-        print("")
-        print("[OK] Build completed successfully!")
-    except subprocess.CalledProcessError as e:
+    pyi_args = ['--noconfirm', spec_path]
+
+    # Key the work/dist dirs on a hash of the build inputs so PyInstaller's
+    # Analysis cache survives rebuilds when nothing changed. Only --clean
+    # throws the cache away, and only when explicitly requested.
+    build_key = compute_build_key()
+    if build_key:
+        pyi_args += ['--workpath', 'build/{}'.format(build_key),
+                     '--distpath', 'dist/{}'.format(build_key)]
+        print("[OK] Build cache key: {}".format(build_key))
+    if clean:
+        pyi_args.append('--clean')
+
+    if not run_pyinstaller(pyi_args, use_subprocess=use_subprocess):
         print("")
-        print("[ERROR] Build failed with error code {}".format(e.returncode))
+        print("[ERROR] Build failed")
         return False
-    
+
+    print("")
+    print("[OK] Build completed successfully!")
+
     print("")
     print("[INFO] Post-build tasks...")
-    
+
     plat = get_platform()
     if onefile:
-        exe_path = 'dist/{}.exe'.format(APP_NAME) if plat == 'windows' else 'dist/{}'.format(APP_NAME)
+        exe_name = '{}.exe'.format(APP_NAME) if plat == 'windows' else APP_NAME
     else:
-        exe_path = 'dist/{}.app'.format(APP_NAME) if plat == 'macos' else 'dist/{}'.format(APP_NAME)
+        exe_name = '{}.app'.format(APP_NAME) if plat == 'macos' else APP_NAME
+
+    exe_path = 'dist/{}'.format(exe_name)
+    if build_key:
+        # Point dist/<name> at the keyed output so downstream scripts
+        # keep finding the bundle at the usual location
+        keyed_path = os.path.join('dist', build_key, exe_name)
+        if os.path.exists(keyed_path):
+            if os.path.islink(exe_path):
+                os.remove(exe_path)
+            if not os.path.exists(exe_path):
+                try:
+                    os.symlink(os.path.join(build_key, exe_name), exe_path)
+                except OSError:
+                    exe_path = keyed_path
     
     if os.path.exists(exe_path):
-        if os.path.isfile(exe_path):
-            size = os.path.getsize(exe_path) / (1024 * 1024)
-        else:
-            size = sum(
-                os.path.getsize(os.path.join(dirpath, filename))
-                for dirpath, dirnames, filenames in os.walk(exe_path)
-                for filename in filenames
-            ) / (1024 * 1024)
-        
+        size = compute_bundle_size(exe_path) / (1024 * 1024)
+
         print("")
         print("=" * 60)
         print("BUILD SUCCESSFUL!")
@@ -363,6 +712,51 @@ def build_executable(onefile=False, clean=False):
         return False
 
 
+def _tree_size(path):
+    """
+    Total size in bytes of a directory tree, using os.scandir so each
+    entry's stat result comes back with the directory listing.
+    """
+    total = 0
+    stack = [path]
+    while stack:
+        with os.scandir(stack.pop()) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                else:
+                    total += entry.stat(follow_symlinks=False).st_size
+    return total
+
+
+def compute_bundle_size(path):
+    """
+    Compute the size of the built bundle in bytes.
+
+    Fans the top-level subdirectories out to a thread pool so the stat
+    syscalls overlap instead of serializing on one thread.
+    """
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+
+    from concurrent.futures import ThreadPoolExecutor
+
+    total = 0
+    subdirs = []
+    with os.scandir(path) as it:
+        for entry in it:
+            if entry.is_dir(follow_symlinks=False):
+                subdirs.append(entry.path)
+            else:
+                total += entry.stat(follow_symlinks=False).st_size
+
+    if subdirs:
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as pool:
+            total += sum(pool.map(_tree_size, subdirs))
+
+    return total
+
+
 def create_assets_directory():
     """Create assets directory with placeholder files."""
     if not os.path.exists('assets'):
@@ -375,7 +769,17 @@ def main():
     parser.add_argument('--onefile', action='store_true', help='Create single-file executable')
     parser.add_argument('--clean', action='store_true', help='Clean previous builds first')
     parser.add_argument('--spec-only', action='store_true', help='Only generate spec file')
-    
+    parser.add_argument('--profile-run', action='store_true',
+                        help='Re-record the traced module manifest before building')
+    parser.add_argument('--no-optimize', action='store_true',
+                        help='Keep docstrings/asserts in bundled bytecode (debug builds)')
+    parser.add_argument('--no-upx', action='store_true',
+                        help='Disable UPX compression entirely (faster build/launch)')
+    parser.add_argument('--subprocess', action='store_true', dest='use_subprocess',
+                        help='Run PyInstaller in a subprocess instead of in-process')
+    parser.add_argument('--features', type=str, default='video,audio,input',
+                        help='Comma-separated features to bundle (default: video,audio,input)')
+
     args = parser.parse_args()
     
     if not os.path.exists('main.py'):
@@ -385,14 +789,23 @@ def main():
     
     create_assets_directory()
     
+    optimize = 0 if args.no_optimize else 2
+    upx = not args.no_upx
+    features = frozenset(f.strip() for f in args.features.split(',') if f.strip())
+    root = snapshot_root()
+
     if args.spec_only:
         ffmpeg_path = check_ffmpeg()
-        spec_content = create_spec_file(onefile=args.onefile, ffmpeg_path=ffmpeg_path)
-        with open('GameOn.spec', 'w') as f:
-            f.write(spec_content)
-        print("[OK] Created GameOn.spec")
+        used_modules = discover_used_modules(force=args.profile_run)
+        spec_content = create_spec_file(onefile=args.onefile, ffmpeg_path=ffmpeg_path,
+                                        used_modules=used_modules, optimize=optimize,
+                                        upx=upx, features=features, root=root)
+        write_spec_if_changed('GameOn.spec', spec_content)
     else:
-        success = build_executable(onefile=args.onefile, clean=args.clean)
+        success = build_executable(onefile=args.onefile, clean=args.clean,
+                                   profile_run=args.profile_run, optimize=optimize,
+                                   upx=upx, use_subprocess=args.use_subprocess,
+                                   features=features)
         sys.exit(0 if success else 1)
 
 
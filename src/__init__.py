@@ -1,13 +1,23 @@
 """
 GameOn - Gameplay Recording for AI Training
 """
+import importlib
 
 __version__ = '1.0.4'
 __author__ = 'GameOn Contributors'
 
-from .capture import VideoCapture, AudioCapture, InputCapture
-from .database import DatabaseManager, Session, InputEvent
-from .session import SessionManager
+# Public attribute -> defining module. Resolved lazily (PEP 562) so that
+# importing the package doesn't drag in sounddevice/numpy/cv2 for entry
+# points that never touch the capture stack.
+_LAZY_ATTRS = {
+    'VideoCapture': '.capture.video_capture',
+    'AudioCapture': '.capture.audio_capture',
+    'InputCapture': '.capture.input_capture',
+    'DatabaseManager': '.database.db_manager',
+    'Session': '.database.models',
+    'InputEvent': '.database.models',
+    'SessionManager': '.session.session_manager',
+}
 
 __all__ = [
     'VideoCapture',
@@ -17,4 +27,17 @@ __all__ = [
     'Session',
     'InputEvent',
     'SessionManager'
-]
\ No newline at end of file
+]
+
+
+def __getattr__(name):
+    """Load public attributes on first access and cache them in globals()."""
+    try:
+        module_path = _LAZY_ATTRS[name]
+    except KeyError:
+        raise AttributeError(
+            f"module {__name__!r} has no attribute {name!r}"
+        ) from None
+    value = getattr(importlib.import_module(module_path, __name__), name)
+    globals()[name] = value
+    return value
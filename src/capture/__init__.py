@@ -1,8 +1,26 @@
 """Capture module for GameOn."""
+import importlib
 
-from .video_capture import VideoCapture
-from .audio_capture import AudioCapture, list_audio_devices
-from .input_capture import InputCapture
+# Resolved lazily (PEP 562): each backend pulls heavy native libs
+# (cv2/mss, sounddevice/soundfile, pynput), so only load what's used.
+_LAZY_ATTRS = {
+    'VideoCapture': '.video_capture',
+    'AudioCapture': '.audio_capture',
+    'InputCapture': '.input_capture',
+    'list_audio_devices': '.audio_capture',
+}
 
 __all__ = ['VideoCapture', 'AudioCapture', 'InputCapture', 'list_audio_devices']
 
+
+def __getattr__(name):
+    """Load public attributes on first access and cache them in globals()."""
+    try:
+        module_path = _LAZY_ATTRS[name]
+    except KeyError:
+        raise AttributeError(
+            f"module {__name__!r} has no attribute {name!r}"
+        ) from None
+    value = getattr(importlib.import_module(module_path, __name__), name)
+    globals()[name] = value
+    return value
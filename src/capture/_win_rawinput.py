@@ -0,0 +1,293 @@
+"""
+Windows raw-input backend for GameOn input capture.
+
+pynput installs low-level hooks that cross the thread boundary once per
+event - expensive with 1000 Hz gaming mice. This module registers for
+WM_INPUT via RegisterRawInputDevices and drains whole batches of events
+with GetRawInputBuffer into one preallocated buffer, so a burst of
+device reports costs a single Python wakeup instead of one per report.
+
+Only importable on Windows; InputCapture falls back to pynput elsewhere.
+"""
+import ctypes
+import threading
+from ctypes import wintypes
+
+user32 = ctypes.WinDLL('user32', use_last_error=True)
+
+# Raw input constants
+HID_USAGE_PAGE_GENERIC = 0x01
+HID_USAGE_GENERIC_MOUSE = 0x02
+HID_USAGE_GENERIC_KEYBOARD = 0x06
+RIDEV_INPUTSINK = 0x00000100
+RID_INPUT = 0x10000003
+RIM_TYPEMOUSE = 0
+RIM_TYPEKEYBOARD = 1
+WM_INPUT = 0x00FF
+WM_QUIT = 0x0012
+PM_REMOVE = 0x0001
+QS_RAWINPUT = 0x0400
+MAPVK_VK_TO_CHAR = 2
+HWND_MESSAGE = -3  # CreateWindowExW parent for message-only windows
+
+user32.CreateWindowExW.restype = wintypes.HWND
+user32.CreateWindowExW.argtypes = (
+    wintypes.DWORD, wintypes.LPCWSTR, wintypes.LPCWSTR, wintypes.DWORD,
+    ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_int,
+    wintypes.HWND, wintypes.HMENU, wintypes.HINSTANCE, wintypes.LPVOID
+)
+user32.DestroyWindow.argtypes = (wintypes.HWND,)
+# Both return UINT; ctypes' default signed c_int restype would turn the
+# dead-key flag (top bit) and the (UINT)-1 error sentinel negative
+user32.MapVirtualKeyW.restype = wintypes.UINT
+user32.GetRawInputBuffer.restype = wintypes.UINT
+
+# Mouse button flags (usButtonFlags)
+RI_MOUSE_BUTTON_FLAGS = (
+    (0x0001, 'Button.left', True),
+    (0x0002, 'Button.left', False),
+    (0x0004, 'Button.right', True),
+    (0x0008, 'Button.right', False),
+    (0x0010, 'Button.middle', True),
+    (0x0020, 'Button.middle', False),
+    (0x0040, 'Button.x1', True),
+    (0x0080, 'Button.x1', False),
+    (0x0100, 'Button.x2', True),
+    (0x0200, 'Button.x2', False),
+)
+RI_MOUSE_WHEEL = 0x0400
+RI_KEY_BREAK = 0x01  # Key release flag
+
+# Virtual keys that have no printable character; named to match pynput
+_VK_NAMES = {
+    0x08: 'Key.backspace', 0x09: 'Key.tab', 0x0D: 'Key.enter',
+    0x10: 'Key.shift', 0x11: 'Key.ctrl', 0x12: 'Key.alt',
+    0x13: 'Key.pause', 0x14: 'Key.caps_lock', 0x1B: 'Key.esc',
+    0x20: 'Key.space', 0x21: 'Key.page_up', 0x22: 'Key.page_down',
+    0x23: 'Key.end', 0x24: 'Key.home', 0x25: 'Key.left',
+    0x26: 'Key.up', 0x27: 'Key.right', 0x28: 'Key.down',
+    0x2C: 'Key.print_screen', 0x2D: 'Key.insert', 0x2E: 'Key.delete',
+    0x5B: 'Key.cmd', 0x5C: 'Key.cmd_r', 0x5D: 'Key.menu',
+    0x70: 'Key.f1', 0x71: 'Key.f2', 0x72: 'Key.f3', 0x73: 'Key.f4',
+    0x74: 'Key.f5', 0x75: 'Key.f6', 0x76: 'Key.f7', 0x77: 'Key.f8',
+    0x78: 'Key.f9', 0x79: 'Key.f10', 0x7A: 'Key.f11', 0x7B: 'Key.f12',
+    0x90: 'Key.num_lock', 0x91: 'Key.scroll_lock',
+    0xA0: 'Key.shift', 0xA1: 'Key.shift_r',
+    0xA2: 'Key.ctrl', 0xA3: 'Key.ctrl_r',
+    0xA4: 'Key.alt', 0xA5: 'Key.alt_r',
+}
+
+
+class RAWINPUTDEVICE(ctypes.Structure):
+    _fields_ = [
+        ('usUsagePage', wintypes.USHORT),
+        ('usUsage', wintypes.USHORT),
+        ('dwFlags', wintypes.DWORD),
+        ('hwndTarget', wintypes.HWND),
+    ]
+
+
+class RAWINPUTHEADER(ctypes.Structure):
+    _fields_ = [
+        ('dwType', wintypes.DWORD),
+        ('dwSize', wintypes.DWORD),
+        ('hDevice', wintypes.HANDLE),
+        ('wParam', wintypes.WPARAM),
+    ]
+
+
+class RAWKEYBOARD(ctypes.Structure):
+    _fields_ = [
+        ('MakeCode', wintypes.USHORT),
+        ('Flags', wintypes.USHORT),
+        ('Reserved', wintypes.USHORT),
+        ('VKey', wintypes.USHORT),
+        ('Message', wintypes.UINT),
+        ('ExtraInformation', wintypes.ULONG),
+    ]
+
+
+class RAWMOUSE(ctypes.Structure):
+    _fields_ = [
+        ('usFlags', wintypes.USHORT),
+        ('usButtonFlags', wintypes.USHORT),
+        ('usButtonData', wintypes.USHORT),
+        ('ulRawButtons', wintypes.ULONG),
+        ('lLastX', wintypes.LONG),
+        ('lLastY', wintypes.LONG),
+        ('ulExtraInformation', wintypes.ULONG),
+    ]
+
+
+class _RAWINPUT_DATA(ctypes.Union):
+    _fields_ = [
+        ('mouse', RAWMOUSE),
+        ('keyboard', RAWKEYBOARD),
+    ]
+
+
+class RAWINPUT(ctypes.Structure):
+    _fields_ = [
+        ('header', RAWINPUTHEADER),
+        ('data', _RAWINPUT_DATA),
+    ]
+
+
+class MSG(ctypes.Structure):
+    _fields_ = [
+        ('hwnd', wintypes.HWND),
+        ('message', wintypes.UINT),
+        ('wParam', wintypes.WPARAM),
+        ('lParam', wintypes.LPARAM),
+        ('time', wintypes.DWORD),
+        ('pt', wintypes.POINT),
+    ]
+
+
+def _vk_name(vk: int) -> str:
+    """Map a virtual-key code to a pynput-compatible key name."""
+    name = _VK_NAMES.get(vk)
+    if name:
+        return name
+    # Dead keys come back with the high bit set; mask to the character
+    char = user32.MapVirtualKeyW(vk, MAPVK_VK_TO_CHAR) & 0xFFFF
+    if char:
+        return chr(char).lower()
+    return f'Key.vk_{vk}'
+
+
+class RawInputListener:
+    """
+    Batched WM_INPUT listener running on its own thread.
+
+    Callbacks (all optional) fire on the listener thread:
+        on_key(key_name, pressed)
+        on_button(button_name, pressed, x, y)
+        on_move(x, y)
+        on_wheel(delta, x, y)
+    """
+
+    # 64 KB drains hundreds of reports per GetRawInputBuffer call
+    _BUFFER_SIZE = 64 * 1024
+
+    def __init__(self, on_key=None, on_button=None, on_move=None,
+                 on_wheel=None):
+        self.on_key = on_key
+        self.on_button = on_button
+        self.on_move = on_move
+        self.on_wheel = on_wheel
+        self._thread = None
+        self._thread_id = None
+        self._started = threading.Event()
+        self._buffer = ctypes.create_string_buffer(self._BUFFER_SIZE)
+
+    def start(self):
+        """Register the devices and start draining events."""
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        if not self._started.wait(timeout=2.0):
+            raise OSError("raw input thread failed to start")
+
+    def stop(self):
+        """Unblock the listener thread and wait for it to exit."""
+        if self._thread_id is not None:
+            user32.PostThreadMessageW(self._thread_id, WM_QUIT, 0, 0)
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+
+    def _cursor_pos(self):
+        pt = wintypes.POINT()
+        user32.GetCursorPos(ctypes.byref(pt))
+        return float(pt.x), float(pt.y)
+
+    def _run(self):
+        kernel32 = ctypes.WinDLL('kernel32')
+        self._thread_id = kernel32.GetCurrentThreadId()
+
+        # WM_INPUT follows the keyboard focus unless the registration
+        # names a window and asks for background delivery - and this
+        # thread owns no window while the game has focus. A hidden
+        # message-only window plus RIDEV_INPUTSINK keeps reports flowing
+        # regardless of which application is foreground.
+        hwnd = user32.CreateWindowExW(
+            0, "STATIC", None, 0, 0, 0, 0, 0,
+            wintypes.HWND(HWND_MESSAGE), None, None, None
+        )
+        if not hwnd:
+            return  # start() times out and reports the failure
+
+        devices = (RAWINPUTDEVICE * 2)(
+            RAWINPUTDEVICE(HID_USAGE_PAGE_GENERIC,
+                           HID_USAGE_GENERIC_KEYBOARD,
+                           RIDEV_INPUTSINK, hwnd),
+            RAWINPUTDEVICE(HID_USAGE_PAGE_GENERIC,
+                           HID_USAGE_GENERIC_MOUSE,
+                           RIDEV_INPUTSINK, hwnd),
+        )
+        if not user32.RegisterRawInputDevices(
+            devices, 2, ctypes.sizeof(RAWINPUTDEVICE)
+        ):
+            user32.DestroyWindow(hwnd)
+            return
+        self._started.set()
+
+        msg = MSG()
+        while True:
+            # Block until input (or WM_QUIT) arrives, then drain in bulk
+            ret = user32.GetMessageW(ctypes.byref(msg), None, 0, 0)
+            if ret <= 0 or msg.message == WM_QUIT:
+                break
+            if msg.message == WM_INPUT:
+                self._drain()
+            # Swallow any further queued WM_INPUTs; _drain got their data
+            while user32.PeekMessageW(ctypes.byref(msg), None,
+                                      WM_INPUT, WM_INPUT, PM_REMOVE):
+                pass
+
+        user32.DestroyWindow(hwnd)
+
+    def _drain(self):
+        """Pull every pending raw-input report in one buffer read."""
+        while True:
+            size = wintypes.UINT(self._BUFFER_SIZE)
+            count = user32.GetRawInputBuffer(
+                ctypes.cast(self._buffer, ctypes.POINTER(RAWINPUT)),
+                ctypes.byref(size),
+                ctypes.sizeof(RAWINPUTHEADER)
+            )
+            if count == 0 or count == 0xFFFFFFFF:
+                return
+
+            offset = 0
+            for _ in range(count):
+                raw = RAWINPUT.from_buffer(self._buffer, offset)
+                if raw.header.dwType == RIM_TYPEKEYBOARD:
+                    self._handle_keyboard(raw.data.keyboard)
+                elif raw.header.dwType == RIM_TYPEMOUSE:
+                    self._handle_mouse(raw.data.mouse)
+                # Blocks are pointer-aligned within the buffer
+                align = ctypes.sizeof(ctypes.c_void_p) - 1
+                offset += (raw.header.dwSize + align) & ~align
+
+    def _handle_keyboard(self, kb: RAWKEYBOARD):
+        if kb.VKey == 0 or kb.VKey > 0xFE:
+            return  # Vendor noise / overrun indicator
+        if self.on_key:
+            self.on_key(_vk_name(kb.VKey), not (kb.Flags & RI_KEY_BREAK))
+
+    def _handle_mouse(self, m: RAWMOUSE):
+        flags = m.usButtonFlags
+        if flags:
+            for flag, name, pressed in RI_MOUSE_BUTTON_FLAGS:
+                if flags & flag and self.on_button:
+                    x, y = self._cursor_pos()
+                    self.on_button(name, pressed, x, y)
+            if flags & RI_MOUSE_WHEEL and self.on_wheel:
+                # usButtonData is a signed WHEEL_DELTA multiple
+                delta = ctypes.c_short(m.usButtonData).value / 120.0
+                x, y = self._cursor_pos()
+                self.on_wheel(delta, x, y)
+        elif (m.lLastX or m.lLastY) and self.on_move:
+            x, y = self._cursor_pos()
+            self.on_move(x, y)
@@ -5,15 +5,83 @@ Supports system audio and microphone capture separately.
 import time
 import platform
 import threading
-import queue
+import functools
 from typing import Optional
-from pathlib import Path
 
 import sounddevice as sd
 import soundfile as sf
 import numpy as np
 
 
+@functools.lru_cache(maxsize=1)
+def _cached_device_list():
+    """
+    Enumerate audio devices once per process.
+
+    PortAudio walks every host API on each query_devices() call (tens of
+    ms on Windows WASAPI); the device set only changes on hot-plug, for
+    which _invalidate_device_cache() exists.
+    """
+    return sd.query_devices()
+
+
+def _invalidate_device_cache():
+    """Drop the cached device list (call after plugging in a device)."""
+    _cached_device_list.cache_clear()
+
+
+class _AudioRingBuffer:
+    """
+    Single-producer/single-consumer ring of audio frames.
+
+    The PortAudio callback (producer) copies each block into preallocated
+    storage - one memcpy, no allocation, no lock. A writer thread
+    (consumer) drains completed frames to disk. Head/tail are plain ints,
+    each written by exactly one side, so no synchronization is needed
+    under the GIL.
+    """
+
+    def __init__(self, capacity_frames: int, channels: int, dtype='float32'):
+        self._buffer = np.empty((capacity_frames, channels), dtype=dtype)
+        self._capacity = capacity_frames
+        self._head = 0  # Total frames written (producer only)
+        self._tail = 0  # Total frames consumed (consumer only)
+
+    def write(self, block) -> bool:
+        """Copy a block into the ring. Returns False (dropping) when full."""
+        frames = len(block)
+        if self._capacity - (self._head - self._tail) < frames:
+            return False
+
+        start = self._head % self._capacity
+        end = start + frames
+        if end <= self._capacity:
+            self._buffer[start:end] = block
+        else:
+            split = self._capacity - start
+            self._buffer[start:] = block[:split]
+            self._buffer[:end - self._capacity] = block[split:]
+
+        self._head += frames
+        return True
+
+    def read_pending(self):
+        """Return a copy of all pending frames (consumer side), or None."""
+        head = self._head  # Snapshot; producer may advance while we copy
+        if head == self._tail:
+            return None
+
+        start = self._tail % self._capacity
+        end = head % self._capacity
+        if start < end:
+            chunk = self._buffer[start:end].copy()
+        else:
+            chunk = np.concatenate((self._buffer[start:], self._buffer[:end]))
+
+        self._tail = head
+        return chunk
+
+
 class AudioCapture:
     """Audio capture handler for system audio and microphone."""
     
@@ -49,7 +117,15 @@ class AudioCapture:
         self.mic_stream = None
         self.system_file = None
         self.mic_file = None
-        
+
+        # Ring buffers + writer threads keep disk I/O off the PortAudio
+        # callback thread (see _AudioRingBuffer)
+        self.system_ring = None
+        self.mic_ring = None
+        self.system_writer = None
+        self.mic_writer = None
+        self.dropped_blocks = 0
+
         self.system_device = None
         self.mic_device = None
         
@@ -59,33 +135,36 @@ class AudioCapture:
         """Initialize audio devices."""
         system = platform.system()
         
-        # List available devices
-        devices = sd.query_devices()
+        # List available devices (cached enumeration)
+        devices = _cached_device_list()
         
         # Find system audio device (loopback/WASAPI on Windows)
         if system == 'Windows' and self.capture_system:
             try:
-                # On Windows, try to find WASAPI loopback device
-                import pyaudiowpatch as pyaudio
-                
-                p = pyaudio.PyAudio()
-                wasapi_info = p.get_host_api_info_by_type(pyaudio.paWASAPI)
-                
-                # Find default loopback device
-                for i in range(wasapi_info.get('deviceCount')):
-                    device_info = p.get_device_info_by_host_api_device_index(
-                        wasapi_info.get('index'), i
-                    )
-                    if device_info.get('maxInputChannels') > 0 and \
-                       'loopback' in device_info.get('name', '').lower():
-                        self.system_device = device_info.get('index')
-                        print(f"✓ Found system audio device: {device_info.get('name')}")
+                # WASAPI loopback records an *output* device as input, so
+                # look for the default WASAPI output endpoint; the stream
+                # itself gets WasapiSettings(loopback=True) in
+                # start_recording.
+                wasapi_idx = None
+                for i, hostapi in enumerate(sd.query_hostapis()):
+                    if 'wasapi' in hostapi['name'].lower():
+                        wasapi_idx = i
                         break
-                
-                p.terminate()
-                
-            except ImportError:
-                print("⚠ pyaudiowpatch not available. System audio capture may not work on Windows.")
+
+                if wasapi_idx is not None:
+                    default_output = sd.query_hostapis(wasapi_idx)['default_output_device']
+                    for i, device_info in enumerate(devices):
+                        if device_info['hostapi'] != wasapi_idx or \
+                           device_info['max_output_channels'] <= 0:
+                            continue
+                        self.system_device = i
+                        if i == default_output:
+                            break
+                    if self.system_device is not None:
+                        print(f"✓ Found system audio device: {devices[self.system_device]['name']}")
+                else:
+                    print("⚠ WASAPI not available. System audio capture may not work on Windows.")
+
             except Exception as e:
                 print(f"⚠ Error detecting system audio device: {e}")
         
@@ -93,7 +172,7 @@ class AudioCapture:
         if self.capture_microphone:
             try:
                 self.mic_device = sd.default.device[0]  # Default input device
-                mic_info = sd.query_devices(self.mic_device, 'input')
+                mic_info = devices[self.mic_device]  # Reuse cached enumeration
                 print(f"✓ Using microphone: {mic_info['name']}")
             except Exception as e:
                 print(f"⚠ Error detecting microphone: {e}")
@@ -101,29 +180,40 @@ class AudioCapture:
     def list_devices(self):
         """Print all available audio devices."""
         print("\n📢 Available Audio Devices:")
-        print(sd.query_devices())
+        print(_cached_device_list())
     
     def _system_audio_callback(self, indata, frames, time_info, status):
-        """Callback for system audio stream."""
+        """Callback for system audio stream (PortAudio thread - no I/O)."""
         if status:
             print(f"⚠ System audio status: {status}")
-        
-        if self.system_file and self.is_recording:
-            try:
-                self.system_file.write(indata.copy())
-            except Exception as e:
-                print(f"❌ Error writing system audio: {e}")
-    
+
+        if self.system_ring is not None and self.is_recording:
+            if not self.system_ring.write(indata):
+                self.dropped_blocks += 1
+
     def _microphone_callback(self, indata, frames, time_info, status):
-        """Callback for microphone stream."""
+        """Callback for microphone stream (PortAudio thread - no I/O)."""
         if status:
             print(f"⚠ Microphone status: {status}")
-        
-        if self.mic_file and self.is_recording:
-            try:
-                self.mic_file.write(indata.copy())
-            except Exception as e:
-                print(f"❌ Error writing microphone audio: {e}")
+
+        if self.mic_ring is not None and self.is_recording:
+            if not self.mic_ring.write(indata):
+                self.dropped_blocks += 1
+
+    def _writer_loop(self, ring: _AudioRingBuffer, sound_file):
+        """Drain a ring buffer to its sound file until recording ends."""
+        while True:
+            chunk = ring.read_pending()
+            if chunk is not None:
+                try:
+                    sound_file.write(chunk)
+                except Exception as e:
+                    print(f"❌ Error writing audio: {e}")
+                    break
+            elif self.is_recording:
+                time.sleep(0.05)
+            else:
+                break
     
     def start_recording(self) -> bool:
         """
@@ -147,18 +237,48 @@ class AudioCapture:
                     mode='w',
                     samplerate=self.sample_rate,
                     channels=self.channels,
-                    format='WAV'
+                    format='WAV',
+                    subtype='PCM_16'
                 )
                 
                 # Start stream
                 device = self.system_device if self.system_device is not None else sd.default.device[0]
+                # ~5s of headroom between callback and disk
+                self.system_ring = _AudioRingBuffer(
+                    self.sample_rate * 5, self.channels, dtype='int16'
+                )
+
+                # Loopback capture of the output endpoint on Windows.
+                # Mainline sounddevice's WasapiSettings has no loopback
+                # kwarg (it needs a patched PortAudio build), so feature-
+                # detect it; without loopback an output endpoint can't be
+                # opened as an input, so degrade to the default input
+                # rather than failing the whole audio start.
+                extra_settings = None
+                if platform.system() == 'Windows' and self.system_device is not None:
+                    try:
+                        extra_settings = sd.WasapiSettings(loopback=True)
+                    except TypeError:
+                        print("⚠ This sounddevice build lacks WASAPI loopback; "
+                              "recording default input instead of system audio")
+                        device = sd.default.device[0]
+
                 self.system_stream = sd.InputStream(
                     device=device,
                     samplerate=self.sample_rate,
                     channels=self.channels,
+                    dtype='int16',
+                    blocksize=4096,
+                    extra_settings=extra_settings,
                     callback=self._system_audio_callback
                 )
                 self.system_stream.start()
+
+                self.system_writer = threading.Thread(
+                    target=self._writer_loop,
+                    args=(self.system_ring, self.system_file),
+                    daemon=True
+                )
                 print(f"🔊 System audio recording started: {self.system_output_path}")
                 
             except Exception as e:
@@ -174,18 +294,32 @@ class AudioCapture:
                     mode='w',
                     samplerate=self.sample_rate,
                     channels=self.channels,
-                    format='WAV'
+                    format='WAV',
+                    subtype='PCM_16'
                 )
                 
                 # Start stream
                 device = self.mic_device if self.mic_device is not None else sd.default.device[0]
+                # ~5s of headroom between callback and disk
+                self.mic_ring = _AudioRingBuffer(
+                    self.sample_rate * 5, self.channels, dtype='int16'
+                )
+
                 self.mic_stream = sd.InputStream(
                     device=device,
                     samplerate=self.sample_rate,
                     channels=self.channels,
+                    dtype='int16',
+                    blocksize=4096,
                     callback=self._microphone_callback
                 )
                 self.mic_stream.start()
+
+                self.mic_writer = threading.Thread(
+                    target=self._writer_loop,
+                    args=(self.mic_ring, self.mic_file),
+                    daemon=True
+                )
                 print(f"🎤 Microphone recording started: {self.microphone_output_path}")
                 
             except Exception as e:
@@ -193,6 +327,15 @@ class AudioCapture:
                 success = False
         
         self.is_recording = success
+
+        # Start writers only once is_recording is set so their loops don't
+        # exit immediately
+        if success:
+            if self.system_writer:
+                self.system_writer.start()
+            if self.mic_writer:
+                self.mic_writer.start()
+
         return success
     
     def stop_recording(self):
@@ -202,7 +345,18 @@ class AudioCapture:
         
         print("⏹ Stopping audio recording...")
         self.is_recording = False
-        
+
+        # Let the writer threads drain their rings before files close
+        if self.system_writer:
+            self.system_writer.join(timeout=5.0)
+            self.system_writer = None
+        if self.mic_writer:
+            self.mic_writer.join(timeout=5.0)
+            self.mic_writer = None
+
+        if self.dropped_blocks:
+            print(f"⚠ Dropped {self.dropped_blocks} audio blocks (ring full)")
+
         # Stop system audio
         if self.system_stream:
             try:
@@ -249,7 +403,7 @@ class AudioCapture:
 def list_audio_devices():
     """Helper function to list all audio devices."""
     print("\n📢 Available Audio Devices:")
-    devices = sd.query_devices()
+    devices = _cached_device_list()
     for i, device in enumerate(devices):
         device_type = []
         if device['max_input_channels'] > 0:
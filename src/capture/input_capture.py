@@ -2,16 +2,145 @@
 Input capture module for GameOn.
 Supports keyboard, mouse, Xbox, and PlayStation controllers.
 """
+import os
+import sys
+import math
 import time
 import platform
 import threading
 from typing import Optional, Callable, List
-from datetime import datetime
-from collections import deque
 
+import numpy as np
 from pynput import keyboard, mouse
 
 
+# evdev code -> name tables for the Linux gamepad reader (common subset;
+# unknown codes fall back to BTN_<n>/ABS_<n>)
+_EVDEV_BTN_NAMES = {
+    0x130: 'BTN_SOUTH', 0x131: 'BTN_EAST', 0x133: 'BTN_NORTH',
+    0x134: 'BTN_WEST', 0x136: 'BTN_TL', 0x137: 'BTN_TR',
+    0x138: 'BTN_TL2', 0x139: 'BTN_TR2', 0x13A: 'BTN_SELECT',
+    0x13B: 'BTN_START', 0x13C: 'BTN_MODE', 0x13D: 'BTN_THUMBL',
+    0x13E: 'BTN_THUMBR',
+}
+_EVDEV_ABS_NAMES = {
+    0x00: 'ABS_X', 0x01: 'ABS_Y', 0x02: 'ABS_Z',
+    0x03: 'ABS_RX', 0x04: 'ABS_RY', 0x05: 'ABS_RZ',
+    0x10: 'ABS_HAT0X', 0x11: 'ABS_HAT0Y',
+}
+
+
+class _EventRing:
+    """
+    Preallocated structure-of-arrays ring buffer for input events.
+
+    A per-event dict costs ~300 B and churns the GC at mouse-move rates;
+    here each event is one slot across parallel NumPy columns, written
+    with a handful of C-level stores. Capacity is a power of two so the
+    write index wraps with a bitmask instead of a modulo. Strings
+    (device, key, action) are interned to small ints via a grow-on-miss
+    table and only rebuilt into dicts when a consumer asks.
+
+    The keyboard listener, mouse listener, and gamepad thread all
+    append, so slot claim and stores happen under a lock; that is still
+    far cheaper than the per-event dict this replaced.
+    """
+
+    CAPACITY = 1 << 14
+    _MASK = CAPACITY - 1
+
+    def __init__(self):
+        cap = self.CAPACITY
+        self._ts = np.empty(cap, np.int32)
+        self._device = np.empty(cap, np.uint16)
+        self._key = np.empty(cap, np.int32)
+        self._action = np.empty(cap, np.uint16)
+        self._value = np.empty(cap, np.float32)
+        self._x = np.empty(cap, np.float32)
+        self._y = np.empty(cap, np.float32)
+        self._head = 0  # Total events ever appended
+        self._lock = threading.Lock()
+
+        # Intern table shared by device/key/action strings
+        self._names = []
+        self._name_ids = {}
+
+    def intern(self, name: str) -> int:
+        """Map a string to its stable small-int code, growing on miss."""
+        try:
+            return self._name_ids[name]
+        except KeyError:
+            # Same multi-producer hazard as append: without the lock two
+            # threads could hand out the same code for different names
+            with self._lock:
+                code = self._name_ids.get(name)
+                if code is None:
+                    code = len(self._names)
+                    self._names.append(name)
+                    self._name_ids[name] = code
+                return code
+
+    def append(self, ts, device, key, action, value, x, y):
+        """Store one event; device/key/action are interned codes."""
+        # Claim-and-store must be atomic: two racing producers would
+        # otherwise write the same slot and leave another uninitialized
+        with self._lock:
+            i = self._head & self._MASK
+            self._ts[i] = ts
+            self._device[i] = device
+            self._key[i] = key
+            self._action[i] = action
+            self._value[i] = math.nan if value is None else value
+            self._x[i] = math.nan if x is None else x
+            self._y[i] = math.nan if y is None else y
+            self._head += 1
+
+    def __len__(self):
+        return self._head if self._head < self.CAPACITY else self.CAPACITY
+
+    def clear(self):
+        """Reset the ring (intern table survives across recordings)."""
+        self._head = 0
+
+    def _as_slices(self, column):
+        """Return the live region of a column as one or two views."""
+        n = len(self)
+        start = (self._head - n) & self._MASK
+        end = start + n
+        if end <= self.CAPACITY:
+            return (column[start:end],)
+        return (column[start:], column[:end - self.CAPACITY])
+
+    def to_dicts(self) -> List[dict]:
+        """Materialize the buffered events as dicts, oldest first."""
+        names = self._names
+        events = []
+        # Walk the live region as at most two contiguous slices per
+        # column; zip then iterates C arrays directly with no per-event
+        # index masking
+        columns = [self._as_slices(col) for col in (
+            self._ts, self._device, self._key, self._action,
+            self._value, self._x, self._y
+        )]
+        for part in range(len(columns[0])):
+            for ts, device, key, action, value, x, y in zip(
+                *(col[part] for col in columns)
+            ):
+                value = float(value)
+                x = float(x)
+                y = float(y)
+                events.append({
+                    'timestamp_ms': int(ts),
+                    'input_device': names[device],
+                    'button_key': names[key],
+                    'action': names[action],
+                    'value': None if math.isnan(value) else value,
+                    'x_position': None if math.isnan(x) else x,
+                    'y_position': None if math.isnan(y) else y
+                })
+        return events
+
+
 class InputCapture:
     """Input capture handler for keyboard, mouse, and gamepads."""
     
@@ -37,183 +166,506 @@ class InputCapture:
         self.event_callback = event_callback
         
         self.is_recording = False
-        self.start_time = None
+        self.start_time_ns = None
+        # Bound method cached so callbacks skip the module attribute lookup
+        self._clock_ns = time.perf_counter_ns
         
         # Listeners
         self.keyboard_listener = None
         self.mouse_listener = None
         self.gamepad_thread = None
+        self.raw_listener = None  # Windows raw-input backend
+        self._stop_event = threading.Event()
         
-        # Event buffer
-        self.events = deque(maxlen=10000)  # Buffer for events
-        
+        # Event buffer (SoA ring; see _EventRing)
+        self.events = _EventRing()
+
+        # Pre-interned codes so the hot callbacks skip the dict lookup
+        self._dev_keyboard = self.events.intern('keyboard')
+        self._dev_mouse = self.events.intern('mouse')
+        self._dev_gamepad = self.events.intern(self.input_type)
+        self._act_press = self.events.intern('press')
+        self._act_release = self.events.intern('release')
+        self._act_move = self.events.intern('move')
+        self._act_scroll = self.events.intern('scroll')
+        self._key_move = self.events.intern('move')
+        self._key_scroll = self.events.intern('scroll')
+
+        # Mouse-move decimation state (see _on_mouse_move)
+        self._mm_ctr = 0
+        self._mm_last = (None, None)
+
+        # key/button object -> (interned name, ring code), so repeat
+        # events skip str()/char extraction and share one name object
+        self._key_cache = {}
+
+        # 256-bit pressed-key bitmap (4x uint64), keyed by virtual-key
+        # code. Consumers diff two snapshots with xor/popcount instead
+        # of replaying per-key dicts (see get_keyboard_state)
+        self._kbd_state = np.zeros(4, np.uint64)
+
         print(f"🎮 Input capture initialized: {self.input_type}")
     
+    def get_keyboard_state(self):
+        """
+        Return a snapshot of the pressed-key bitmap (4x uint64).
+
+        Bit i of the flattened 256-bit word is set while virtual key i is
+        held. Two snapshots xor'd give the keys that changed between
+        them, so label-generation passes can scan machine words instead
+        of event dicts.
+        """
+        return self._kbd_state.copy()
+
     def get_timestamp_ms(self) -> int:
         """Get current timestamp in milliseconds from recording start."""
-        if not self.start_time:
+        if not self.start_time_ns:
             return 0
-        elapsed = (time.time() - self.start_time) * 1000
-        return int(elapsed + self.latency_offset_ms)
+        # Integer nanosecond arithmetic: monotonic, no FP rounding drift,
+        # and cheaper than float subtract/multiply per event
+        return (self._clock_ns() - self.start_time_ns) // 1_000_000 \
+            + self.latency_offset_ms
     
+    def _key_identity(self, key):
+        """Resolve a pynput key/button to its cached (name, code) pair."""
+        try:
+            cached = self._key_cache.get(key)
+        except TypeError:
+            cached = None  # Unhashable key object; resolve uncached
+        if cached is not None:
+            return cached
+
+        try:
+            name = key.char if hasattr(key, 'char') else str(key)
+        except AttributeError:
+            name = str(key)
+        if isinstance(name, str):
+            name = sys.intern(name)
+
+        cached = (name, self.events.intern(name))
+        try:
+            self._key_cache[key] = cached
+        except TypeError:
+            pass
+        return cached
+
     def _on_keyboard_press(self, key):
         """Callback for keyboard press events."""
         if not self.is_recording:
             return
         
-        try:
-            # Try to get character
-            key_name = key.char if hasattr(key, 'char') else str(key)
-        except AttributeError:
-            key_name = str(key)
-        
-        event = {
-            'timestamp_ms': self.get_timestamp_ms(),
-            'input_device': 'keyboard',
-            'button_key': key_name,
-            'action': 'press',
-            'value': 1.0,
-            'x_position': None,
-            'y_position': None
-        }
-        
-        self.events.append(event)
-        
+        key_name, key_code = self._key_identity(key)
+
+        vk = getattr(key, 'vk', None)
+        if vk is not None and 0 <= vk < 256:
+            self._kbd_state[vk >> 6] |= np.uint64(1 << (vk & 63))
+
+        ts = self.get_timestamp_ms()
+        self.events.append(
+            ts, self._dev_keyboard, key_code,
+            self._act_press, 1.0, None, None
+        )
+
         if self.event_callback:
-            self.event_callback(event)
+            self.event_callback({
+                'timestamp_ms': ts,
+                'input_device': 'keyboard',
+                'button_key': key_name,
+                'action': 'press',
+                'value': 1.0,
+                'x_position': None,
+                'y_position': None
+            })
     
     def _on_keyboard_release(self, key):
         """Callback for keyboard release events."""
         if not self.is_recording:
             return
         
-        try:
-            key_name = key.char if hasattr(key, 'char') else str(key)
-        except AttributeError:
-            key_name = str(key)
-        
-        event = {
-            'timestamp_ms': self.get_timestamp_ms(),
-            'input_device': 'keyboard',
-            'button_key': key_name,
-            'action': 'release',
-            'value': 0.0,
-            'x_position': None,
-            'y_position': None
-        }
-        
-        self.events.append(event)
-        
+        key_name, key_code = self._key_identity(key)
+
+        vk = getattr(key, 'vk', None)
+        if vk is not None and 0 <= vk < 256:
+            self._kbd_state[vk >> 6] &= ~np.uint64(1 << (vk & 63))
+
+        ts = self.get_timestamp_ms()
+        self.events.append(
+            ts, self._dev_keyboard, key_code,
+            self._act_release, 0.0, None, None
+        )
+
         if self.event_callback:
-            self.event_callback(event)
+            self.event_callback({
+                'timestamp_ms': ts,
+                'input_device': 'keyboard',
+                'button_key': key_name,
+                'action': 'release',
+                'value': 0.0,
+                'x_position': None,
+                'y_position': None
+            })
     
     def _on_mouse_click(self, x, y, button, pressed):
         """Callback for mouse click events."""
         if not self.is_recording:
             return
         
-        event = {
-            'timestamp_ms': self.get_timestamp_ms(),
-            'input_device': 'mouse',
-            'button_key': str(button),
-            'action': 'press' if pressed else 'release',
-            'value': 1.0 if pressed else 0.0,
-            'x_position': float(x),
-            'y_position': float(y)
-        }
-        
-        self.events.append(event)
-        
+        button_name, button_code = self._key_identity(button)
+
+        ts = self.get_timestamp_ms()
+        self.events.append(
+            ts, self._dev_mouse, button_code,
+            self._act_press if pressed else self._act_release,
+            1.0 if pressed else 0.0, x, y
+        )
+
         if self.event_callback:
-            self.event_callback(event)
+            self.event_callback({
+                'timestamp_ms': ts,
+                'input_device': 'mouse',
+                'button_key': button_name,
+                'action': 'press' if pressed else 'release',
+                'value': 1.0 if pressed else 0.0,
+                'x_position': float(x),
+                'y_position': float(y)
+            })
     
     def _on_mouse_move(self, x, y):
         """Callback for mouse move events."""
         if not self.is_recording:
             return
         
-        # Only record every Nth mouse move to avoid overwhelming the database
-        if len(self.events) % 10 == 0:  # Record 1 in 10 move events
-            event = {
-                'timestamp_ms': self.get_timestamp_ms(),
+        # Record 1 in 8 move events to avoid overwhelming the database.
+        # A dedicated counter decimates by move count (the old test used
+        # the total event count, so keyboard bursts skewed the rate) and
+        # the power-of-two mask is cheaper than a modulo.
+        self._mm_ctr += 1
+        if self._mm_ctr & 0x7:
+            return
+
+        # Coalesce stationary/sub-pixel moves
+        if (x, y) == self._mm_last:
+            return
+        self._mm_last = (x, y)
+
+        ts = self.get_timestamp_ms()
+        self.events.append(
+            ts, self._dev_mouse, self._key_move,
+            self._act_move, None, x, y
+        )
+
+        if self.event_callback:
+            self.event_callback({
+                'timestamp_ms': ts,
                 'input_device': 'mouse',
                 'button_key': 'move',
                 'action': 'move',
                 'value': None,
                 'x_position': float(x),
                 'y_position': float(y)
-            }
-            
-            self.events.append(event)
-            
-            if self.event_callback:
-                self.event_callback(event)
+            })
     
     def _on_mouse_scroll(self, x, y, dx, dy):
         """Callback for mouse scroll events."""
         if not self.is_recording:
             return
         
-        event = {
-            'timestamp_ms': self.get_timestamp_ms(),
-            'input_device': 'mouse',
-            'button_key': 'scroll',
-            'action': 'scroll',
-            'value': float(dy),  # Vertical scroll amount
-            'x_position': float(x),
-            'y_position': float(y)
-        }
-        
-        self.events.append(event)
-        
+        ts = self.get_timestamp_ms()
+        self.events.append(
+            ts, self._dev_mouse, self._key_scroll,
+            self._act_scroll, dy, x, y
+        )
+
         if self.event_callback:
-            self.event_callback(event)
+            self.event_callback({
+                'timestamp_ms': ts,
+                'input_device': 'mouse',
+                'button_key': 'scroll',
+                'action': 'scroll',
+                'value': float(dy),  # Vertical scroll amount
+                'x_position': float(x),
+                'y_position': float(y)
+            })
     
+    def _raw_on_key(self, key_name, pressed):
+        """Raw-input keyboard event (listener thread - mirrors pynput path)."""
+        if not self.is_recording:
+            return
+        ts = self.get_timestamp_ms()
+        self.events.append(
+            ts, self._dev_keyboard, self.events.intern(key_name),
+            self._act_press if pressed else self._act_release,
+            1.0 if pressed else 0.0, None, None
+        )
+        if self.event_callback:
+            self.event_callback({
+                'timestamp_ms': ts,
+                'input_device': 'keyboard',
+                'button_key': key_name,
+                'action': 'press' if pressed else 'release',
+                'value': 1.0 if pressed else 0.0,
+                'x_position': None,
+                'y_position': None
+            })
+
+    def _raw_on_button(self, button_name, pressed, x, y):
+        """Raw-input mouse button event."""
+        self._on_mouse_click(x, y, button_name, pressed)
+
+    def _raw_on_move(self, x, y):
+        """Raw-input mouse move event (same decimation as pynput path)."""
+        self._on_mouse_move(x, y)
+
+    def _raw_on_wheel(self, delta, x, y):
+        """Raw-input mouse wheel event."""
+        self._on_mouse_scroll(x, y, 0, delta)
+
+    def _emit_gamepad(self, code: str, is_press: bool, value: float):
+        """Record one gamepad event from a capture loop."""
+        ts = self.get_timestamp_ms()
+        self.events.append(
+            ts, self._dev_gamepad, self.events.intern(code),
+            self._act_press if is_press else self._act_move,
+            value, None, None
+        )
+
+        if self.event_callback:
+            self.event_callback({
+                'timestamp_ms': ts,
+                'input_device': self.input_type,
+                'button_key': code,
+                'action': 'press' if is_press else 'move',
+                'value': value,
+                'x_position': None,
+                'y_position': None
+            })
+
+    def _xinput_loop(self) -> bool:
+        """
+        Poll an Xbox controller directly via XInputGetState.
+
+        The 'inputs' library decodes every report through a Python-level
+        event parser and sleeps up to a second after transient errors.
+        Polling the XInput state struct at ~1 kHz and diffing against the
+        previous snapshot emits events only on change, with no decoder in
+        between and no stalls.
+
+        Returns:
+            False if no XInput runtime/controller is available (caller
+            falls back to the 'inputs' loop)
+        """
+        import ctypes
+
+        xinput = None
+        for dll in ('xinput1_4', 'xinput1_3', 'xinput9_1_0'):
+            try:
+                xinput = getattr(ctypes.windll, dll)
+                break
+            except OSError:
+                continue
+        if xinput is None:
+            return False
+
+        class XINPUT_GAMEPAD(ctypes.Structure):
+            _fields_ = [
+                ('wButtons', ctypes.c_ushort),
+                ('bLeftTrigger', ctypes.c_ubyte),
+                ('bRightTrigger', ctypes.c_ubyte),
+                ('sThumbLX', ctypes.c_short),
+                ('sThumbLY', ctypes.c_short),
+                ('sThumbRX', ctypes.c_short),
+                ('sThumbRY', ctypes.c_short),
+            ]
+
+        class XINPUT_STATE(ctypes.Structure):
+            _fields_ = [
+                ('dwPacketNumber', ctypes.c_ulong),
+                ('Gamepad', XINPUT_GAMEPAD),
+            ]
+
+        # evdev-style codes, matching what the 'inputs' path produced
+        buttons = (
+            (0x1000, 'BTN_SOUTH'), (0x2000, 'BTN_EAST'),
+            (0x4000, 'BTN_NORTH'), (0x8000, 'BTN_WEST'),
+            (0x0100, 'BTN_TL'), (0x0200, 'BTN_TR'),
+            (0x0020, 'BTN_SELECT'), (0x0010, 'BTN_START'),
+            (0x0040, 'BTN_THUMBL'), (0x0080, 'BTN_THUMBR'),
+            (0x0001, 'BTN_DPAD_UP'), (0x0002, 'BTN_DPAD_DOWN'),
+            (0x0004, 'BTN_DPAD_LEFT'), (0x0008, 'BTN_DPAD_RIGHT'),
+        )
+        axes = (
+            ('sThumbLX', 'ABS_X'), ('sThumbLY', 'ABS_Y'),
+            ('sThumbRX', 'ABS_RX'), ('sThumbRY', 'ABS_RY'),
+            ('bLeftTrigger', 'ABS_Z'), ('bRightTrigger', 'ABS_RZ'),
+        )
+
+        state = XINPUT_STATE()
+        if xinput.XInputGetState(0, ctypes.byref(state)) != 0:
+            return False  # ERROR_DEVICE_NOT_CONNECTED
+
+        print(f"🎮 Gamepad capture started (XInput polling)")
+
+        prev_buttons = state.Gamepad.wButtons
+        prev_axes = {attr: getattr(state.Gamepad, attr) for attr, _ in axes}
+        last_packet = state.dwPacketNumber
+
+        while not self._stop_event.wait(0.001):
+            if xinput.XInputGetState(0, ctypes.byref(state)) != 0:
+                print("⚠ Gamepad disconnected")
+                # Keep polling cheaply until it returns or we stop
+                if self._stop_event.wait(1.0):
+                    break
+                continue
+
+            if state.dwPacketNumber == last_packet:
+                continue
+            last_packet = state.dwPacketNumber
+
+            pad = state.Gamepad
+            changed = pad.wButtons ^ prev_buttons
+            if changed:
+                for mask, code in buttons:
+                    if changed & mask:
+                        pressed = bool(pad.wButtons & mask)
+                        self._emit_gamepad(code, True,
+                                           1.0 if pressed else 0.0)
+                prev_buttons = pad.wButtons
+
+            for attr, code in axes:
+                value = getattr(pad, attr)
+                if value != prev_axes[attr]:
+                    prev_axes[attr] = value
+                    self._emit_gamepad(code, False, float(value))
+
+        return True
+
+    def _linux_evdev_loop(self) -> bool:
+        """
+        Read gamepad events straight from /dev/input on Linux.
+
+        One selector services every connected pad on this thread, and
+        each wakeup drains a whole burst of reports with a single read,
+        parsing struct input_event records in place - no per-event
+        library decoding, and adding controllers costs no extra threads.
+
+        Returns:
+            False if no joystick device nodes are present
+        """
+        import glob
+        import struct
+        import selectors
+
+        paths = sorted(glob.glob('/dev/input/by-id/*-event-joystick'))
+        if not paths:
+            return False
+
+        # struct input_event: timeval + type + code + value
+        event = struct.Struct('llHHi')
+        selector = selectors.DefaultSelector()
+        fds = []
+        for path in paths:
+            try:
+                fd = os.open(path, os.O_RDONLY | os.O_NONBLOCK)
+            except OSError as e:
+                print(f"⚠ Cannot open {path}: {e}")
+                continue
+            selector.register(fd, selectors.EVENT_READ)
+            fds.append(fd)
+
+        if not fds:
+            selector.close()
+            return False
+
+        print(f"🎮 Gamepad capture started (evdev, {len(fds)} device(s))")
+
+        try:
+            while not self._stop_event.is_set():
+                for key, _ in selector.select(timeout=0.25):
+                    try:
+                        data = os.read(key.fd, 4096)
+                    except BlockingIOError:
+                        continue
+                    except OSError:
+                        print("⚠ Gamepad disconnected")
+                        selector.unregister(key.fd)
+                        os.close(key.fd)
+                        fds.remove(key.fd)
+                        continue
+
+                    for offset in range(0, len(data) - event.size + 1,
+                                        event.size):
+                        _, _, etype, code, value = event.unpack_from(
+                            data, offset
+                        )
+                        if etype == 0x01:  # EV_KEY
+                            self._emit_gamepad(
+                                _EVDEV_BTN_NAMES.get(code, f'BTN_{code}'),
+                                True, float(value)
+                            )
+                        elif etype == 0x03:  # EV_ABS
+                            self._emit_gamepad(
+                                _EVDEV_ABS_NAMES.get(code, f'ABS_{code}'),
+                                False, float(value)
+                            )
+        finally:
+            for fd in fds:
+                os.close(fd)
+            selector.close()
+
+        return True
+
     def _gamepad_loop(self):
         """Loop for capturing gamepad inputs."""
         system = platform.system()
-        
+
+        if system == 'Linux':
+            try:
+                if self._linux_evdev_loop():
+                    return
+                print("⚠ No gamepad device nodes found under /dev/input/by-id")
+            except Exception as e:
+                print(f"❌ Gamepad initialization error: {e}")
+            return
+
         if system != 'Windows':
-            print("⚠ Gamepad capture is currently only supported on Windows")
+            print("⚠ Gamepad capture is currently only supported on Windows and Linux")
             return
-        
+
+        # Xbox pads get the direct XInput poller; PlayStation pads (and
+        # any XInput failure) go through the 'inputs' library as before
+        if self.input_type == 'xbox':
+            try:
+                if self._xinput_loop():
+                    return
+                print("⚠ XInput unavailable, falling back to 'inputs'")
+            except Exception as e:
+                print(f"⚠ XInput error ({e}), falling back to 'inputs'")
+
         try:
             import inputs
             
             print(f"🎮 Gamepad capture started ({self.input_type})")
             
-            while self.is_recording:
+            while not self._stop_event.is_set():
                 try:
                     events = inputs.get_gamepad()
                     
                     for event in events:
-                        if not self.is_recording:
+                        if self._stop_event.is_set():
                             break
                         
-                        # Map event type
-                        action = 'press' if event.ev_type == 'Key' else 'move'
-                        
-                        input_event = {
-                            'timestamp_ms': self.get_timestamp_ms(),
-                            'input_device': self.input_type,
-                            'button_key': event.code,
-                            'action': action,
-                            'value': float(event.state),
-                            'x_position': None,
-                            'y_position': None
-                        }
-                        
-                        self.events.append(input_event)
-                        
-                        if self.event_callback:
-                            self.event_callback(input_event)
+                        self._emit_gamepad(
+                            event.code,
+                            event.ev_type == 'Key',
+                            float(event.state)
+                        )
                 
                 except inputs.UnpluggedError:
                     print("⚠ Gamepad disconnected")
-                    time.sleep(1.0)
+                    self._stop_event.wait(1.0)
                 except Exception as e:
                     print(f"⚠ Gamepad error: {e}")
-                    time.sleep(0.1)
+                    self._stop_event.wait(0.1)
         
         except ImportError:
             print("❌ 'inputs' library not installed. Gamepad capture unavailable.")
@@ -232,11 +684,31 @@ class InputCapture:
             return False
         
         self.is_recording = True
-        self.start_time = time.time()
+        self.start_time_ns = self._clock_ns()
+        self._stop_event.clear()
+        self._kbd_state[:] = 0
         self.events.clear()
         
         # Start keyboard/mouse capture
         if self.input_type == 'keyboard':
+            # Prefer batched WM_INPUT capture on Windows: one wakeup per
+            # burst of reports instead of one hook callback per event
+            if platform.system() == 'Windows':
+                try:
+                    from . import _win_rawinput
+                    self.raw_listener = _win_rawinput.RawInputListener(
+                        on_key=self._raw_on_key,
+                        on_button=self._raw_on_button if self.capture_mouse else None,
+                        on_move=self._raw_on_move if self.capture_mouse else None,
+                        on_wheel=self._raw_on_wheel if self.capture_mouse else None
+                    )
+                    self.raw_listener.start()
+                    print("⌨️  Raw input capture started (keyboard + mouse)")
+                    return True
+                except Exception as e:
+                    print(f"⚠ Raw input unavailable ({e}), falling back to pynput")
+                    self.raw_listener = None
+
             try:
                 # Start keyboard listener
                 self.keyboard_listener = keyboard.Listener(
@@ -295,7 +767,16 @@ class InputCapture:
         
         print("⏹ Stopping input capture...")
         self.is_recording = False
-        
+        self._stop_event.set()
+
+        # Stop raw-input listener (Windows)
+        if self.raw_listener:
+            try:
+                self.raw_listener.stop()
+            except Exception as e:
+                print(f"⚠ Error stopping raw input listener: {e}")
+            self.raw_listener = None
+
         # Stop keyboard listener
         if self.keyboard_listener:
             try:
@@ -318,14 +799,14 @@ class InputCapture:
             self.gamepad_thread = None
         
         # Get captured events
-        captured_events = list(self.events)
+        captured_events = self.events.to_dicts()
         print(f"✓ Input capture stopped. Captured {len(captured_events)} events")
         
         return captured_events
     
     def get_events(self) -> List[dict]:
         """Get all captured events without stopping recording."""
-        return list(self.events)
+        return self.events.to_dicts()
     
     def __enter__(self):
         """Context manager entry."""
@@ -1,7 +1,29 @@
 """Database module for GameOn."""
+import importlib
 
-from .models import Session, InputEvent, DatabaseSchema, ActionCode, FrameTimestamp, SessionHealth
-from .db_manager import DatabaseManager
+# Resolved lazily (PEP 562), matching the package-level pattern
+_LAZY_ATTRS = {
+    'Session': '.models',
+    'InputEvent': '.models',
+    'DatabaseSchema': '.models',
+    'ActionCode': '.models',
+    'FrameTimestamp': '.models',
+    'SessionHealth': '.models',
+    'DatabaseManager': '.db_manager',
+    'normalize_events_array': '.db_manager',
+}
 
-__all__ = ['Session', 'InputEvent', 'DatabaseSchema', 'ActionCode', 'FrameTimestamp', 'SessionHealth', 'DatabaseManager']
+__all__ = ['Session', 'InputEvent', 'DatabaseSchema', 'ActionCode', 'FrameTimestamp', 'SessionHealth', 'DatabaseManager', 'normalize_events_array']
 
+
+def __getattr__(name):
+    """Load public attributes on first access and cache them in globals()."""
+    try:
+        module_path = _LAZY_ATTRS[name]
+    except KeyError:
+        raise AttributeError(
+            f"module {__name__!r} has no attribute {name!r}"
+        ) from None
+    value = getattr(importlib.import_module(module_path, __name__), name)
+    globals()[name] = value
+    return value
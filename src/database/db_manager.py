@@ -5,347 +5,815 @@ Enhanced with action code auto-creation, batch operations, and session recovery.
 """
 import sqlite3
 import os
+import atexit
+import threading
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Optional, List, Dict
+from itertools import chain
+from operator import attrgetter
+from typing import Optional, List, Dict, Iterator
 from pathlib import Path
 
 from .models import DatabaseSchema, Session, InputEvent, ActionCode, FrameTimestamp, SessionHealth
 
+# Explicit column lists, in the positional order the model constructors
+# expect. SELECT * couples unpacking to physical column order, forces
+# SQLite to materialize every column, and defeats covering indexes.
+SESSION_COLS = (
+    "id, game_name, start_time, end_time, duration_seconds, video_path, "
+    "system_audio_path, microphone_audio_path, input_type, fps, "
+    "latency_offset_ms, status, monitor_index, notes, video_width, "
+    "video_height, video_codec, total_frames, file_size_bytes"
+)
+
+INPUT_EVENT_COLS = (
+    "id, session_id, timestamp_ms, input_device, button_key, action, "
+    "value, x_position, y_position, action_code"
+)
+
+# Pulls all 18 writable Session attributes in one C-level call instead
+# of 18 LOAD_ATTR round trips per insert/update
+_SESSION_ATTRS = attrgetter(
+    'game_name', 'start_time', 'end_time', 'duration_seconds',
+    'video_path', 'system_audio_path', 'microphone_audio_path',
+    'input_type', 'fps', 'latency_offset_ms', 'status', 'monitor_index',
+    'notes', 'video_width', 'video_height', 'video_codec',
+    'total_frames', 'file_size_bytes'
+)
+
+
+# Memoized datetime -> ISO string serialization. Session start/end
+# times and health-check times repeat across calls (a session keeps one
+# start_time through every update), so each distinct datetime is
+# formatted exactly once. Bounded so a long-running process can't grow
+# it without limit.
+_iso_cache = {}
+
+
+def _iso(dt) -> Optional[str]:
+    """ISO-format a datetime (or None), caching the result."""
+    if dt is None:
+        return None
+    cached = _iso_cache.get(dt)
+    if cached is None:
+        if len(_iso_cache) > 1024:
+            _iso_cache.clear()
+        cached = _iso_cache[dt] = dt.isoformat()
+    return cached
+
+
+def normalize_events_array(arr, screen_width: int = 1920,
+                           screen_height: int = 1080) -> dict:
+    """
+    Vectorized counterpart of InputEvent.to_normalized_dict.
+
+    Operates on the structured array from get_input_events_array: one
+    NumPy divide per column replaces a Python attribute read, branch,
+    and float divide per event. Rows without a position carry NaN from
+    the array reader and stay NaN here; value_normalized is NaN for
+    non-controller rows.
+
+    Args:
+        arr: Structured array from get_input_events_array
+        screen_width: Screen width for normalizing mouse positions
+        screen_height: Screen height for normalizing mouse positions
+
+    Returns:
+        Dict with 'x_normalized', 'y_normalized', and 'value_normalized'
+        float32 vectors aligned with arr
+    """
+    import numpy as np  # Deferred: only the ML read path needs it
+
+    value = np.where(
+        np.isin(arr['input_device'], (b'xbox', b'playstation')),
+        (arr['value'] - 128.0) / 128.0,
+        np.float32(np.nan)
+    )
+    return {
+        'x_normalized': arr['x_position'] / np.float32(screen_width),
+        'y_normalized': arr['y_position'] / np.float32(screen_height),
+        'value_normalized': value.astype(np.float32)
+    }
+
+
+def _session_to_row(session: Session) -> tuple:
+    """Marshal a Session into INSERT/UPDATE parameter order."""
+    row = _SESSION_ATTRS(session)
+    return (row[0], _iso(row[1]), _iso(row[2])) + row[3:]
+
 
 class DatabaseManager:
     """Manages SQLite database operations for GameOn."""
-    
+
+    # Applied once per connection. WAL lets the recording threads write
+    # while the UI reads, synchronous=NORMAL drops the per-commit fsync
+    # (WAL makes that safe), and the rest size the page cache and memory
+    # map for event-stream workloads.
+    _TUNING_PRAGMAS = """
+        PRAGMA foreign_keys=ON;
+        PRAGMA journal_mode=WAL;
+        PRAGMA synchronous=NORMAL;
+        PRAGMA temp_store=MEMORY;
+        PRAGMA cache_size=-64000;
+        PRAGMA mmap_size=2147483648;
+        PRAGMA busy_timeout=5000;
+    """
+
+    # Same tuning for read-only handles, minus journal_mode and
+    # synchronous, which belong to the writer. The mmap request asks for
+    # the whole database so reads are served from the mapping with no
+    # pread() syscalls; SQLite clamps it to the build's
+    # SQLITE_MAX_MMAP_SIZE (2 GB on default builds), so oversizing is
+    # free and forward-compatible with larger-limit builds.
+    _RO_TUNING_PRAGMAS = """
+        PRAGMA temp_store=MEMORY;
+        PRAGMA cache_size=-64000;
+        PRAGMA mmap_size=34359738368;
+        PRAGMA busy_timeout=5000;
+    """
+
+    # Buffered single-row inserts flush once this many rows accumulate
+    _FLUSH_THRESHOLD = 256
+
+    # ...or after this many seconds, whichever comes first, so a quiet
+    # stretch of input never leaves events sitting in memory
+    _FLUSH_INTERVAL_SECONDS = 0.5
+
+    # Canonical SQL for the hot write paths, stored once so repeated
+    # calls present the same string to the connection's statement cache
+    _INSERT_EVENT_SQL = """
+    INSERT INTO input_events (
+        session_id, timestamp_ms, input_device, button_key,
+        action, value, x_position, y_position, action_code
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """
+
+    _INSERT_FRAME_SQL = """
+    INSERT INTO frame_timestamps (
+        session_id, frame_number, capture_timestamp_ms,
+        write_timestamp_ms, dropped
+    ) VALUES (?, ?, ?, ?, ?)
+    """
+
+    _INSERT_HEALTH_SQL = """
+    INSERT INTO session_health (
+        session_id, check_time, disk_space_gb, cpu_percent,
+        memory_mb, frames_captured, frames_dropped
+    ) VALUES (?, ?, ?, ?, ?, ?, ?)
+    """
+
+    _INSERT_SESSION_SQL = """
+    INSERT INTO sessions (
+        game_name, start_time, end_time, duration_seconds,
+        video_path, system_audio_path, microphone_audio_path,
+        input_type, fps, latency_offset_ms, status, monitor_index, notes,
+        video_width, video_height, video_codec, total_frames, file_size_bytes
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    RETURNING id
+    """
+
+    _UPSERT_SESSION_SQL = """
+    INSERT INTO sessions (
+        id, game_name, start_time, end_time, duration_seconds,
+        video_path, system_audio_path, microphone_audio_path,
+        input_type, fps, latency_offset_ms, status, monitor_index, notes,
+        video_width, video_height, video_codec, total_frames, file_size_bytes
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(id) DO UPDATE SET
+        game_name = excluded.game_name,
+        start_time = excluded.start_time,
+        end_time = excluded.end_time,
+        duration_seconds = excluded.duration_seconds,
+        video_path = excluded.video_path,
+        system_audio_path = excluded.system_audio_path,
+        microphone_audio_path = excluded.microphone_audio_path,
+        input_type = excluded.input_type,
+        fps = excluded.fps,
+        latency_offset_ms = excluded.latency_offset_ms,
+        status = excluded.status,
+        monitor_index = excluded.monitor_index,
+        notes = excluded.notes,
+        video_width = excluded.video_width,
+        video_height = excluded.video_height,
+        video_codec = excluded.video_codec,
+        total_frames = excluded.total_frames,
+        file_size_bytes = excluded.file_size_bytes
+    RETURNING id
+    """
+
+    # SELECTs are hoisted too: the query text is built once at class
+    # creation instead of per call, and every call presents the identical
+    # string object to the statement cache
+    _SELECT_SESSION_SQL = f"SELECT {SESSION_COLS} FROM sessions WHERE id = ?"
+
+    _SELECT_SESSIONS_BY_GAME_SQL = (
+        f"SELECT {SESSION_COLS} FROM sessions "
+        "WHERE game_name = ? ORDER BY start_time DESC"
+    )
+
+    _SELECT_ALL_SESSIONS_SQL = (
+        f"SELECT {SESSION_COLS} FROM sessions ORDER BY start_time DESC LIMIT ?"
+    )
+
+    _SELECT_INCOMPLETE_SESSIONS_SQL = (
+        f"SELECT {SESSION_COLS} FROM sessions "
+        "WHERE status = 'recording' OR end_time IS NULL"
+    )
+
+    _SELECT_EVENTS_SQL = (
+        f"SELECT {INPUT_EVENT_COLS} FROM input_events "
+        "WHERE session_id = ? ORDER BY timestamp_ms"
+    )
+
+    _UPDATE_SESSION_SQL = """
+    UPDATE sessions SET
+        game_name = ?,
+        start_time = ?,
+        end_time = ?,
+        duration_seconds = ?,
+        video_path = ?,
+        system_audio_path = ?,
+        microphone_audio_path = ?,
+        input_type = ?,
+        fps = ?,
+        latency_offset_ms = ?,
+        status = ?,
+        monitor_index = ?,
+        notes = ?,
+        video_width = ?,
+        video_height = ?,
+        video_codec = ?,
+        total_frames = ?,
+        file_size_bytes = ?
+    WHERE id = ?
+    """
+
     def __init__(self, db_path: str):
         """
         Initialize database manager.
-        
+
         Args:
             db_path: Path to SQLite database file
         """
         self.db_path = db_path
         self._action_code_cache = {}  # Cache for action codes
+        self._local = threading.local()  # One tuned connection per thread
+
+        # Single-row adds buffer here and flush in one transaction; a
+        # WAL commit per event dominates under a capture loop emitting
+        # hundreds of rows per second
+        self._buffer_lock = threading.Lock()
+        self._event_buffer = []
+        self._frame_buffer = []
+        self._health_buffer = []
+
         self._ensure_database_exists()
-    
+        self._warm_action_code_cache()
+
+        # Background flush so buffered rows reach disk within
+        # _FLUSH_INTERVAL_SECONDS even when event rates are low. Capture
+        # threads never execute SQL themselves: a full buffer just sets
+        # _flush_wakeup and the flush thread does the transaction, so an
+        # fsync stall can't add jitter to the capture loop.
+        self._flush_wakeup = threading.Event()
+        self._stop_flushing = threading.Event()
+        self._flush_thread = threading.Thread(
+            target=self._flush_loop, daemon=True, name="db-flush"
+        )
+        self._flush_thread.start()
+
+        # Flush buffers and compact the WAL even if the caller forgets
+        # to close() on the way out
+        atexit.register(self.close)
+
+    def _warm_action_code_cache(self):
+        """
+        Load the whole action-code identity map in one query.
+
+        action_codes is tiny and bounded (one row per distinct button),
+        so keeping it fully resident turns the steady-state lookup in
+        get_or_create_action_code into a pure dict hit with zero SQL,
+        even across process restarts.
+        """
+        cursor = self._connect_ro().cursor()
+        cursor.execute("SELECT id, input_device, raw_input FROM action_codes")
+        for code_id, device, raw in cursor:
+            self._action_code_cache[f"{device}:{raw}"] = code_id
+
+    def reset_action_code_cache(self):
+        """
+        Drop and rebuild the in-process action-code cache.
+
+        Only needed after another process rewrites action_codes (e.g. a
+        migration); normal operation keeps the cache coherent because
+        codes are append-only.
+        """
+        self._action_code_cache.clear()
+        self._warm_action_code_cache()
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Get this thread's persistent connection, creating it on first use.
+
+        Opening sqlite3.connect() per call re-reads the schema and starts
+        with a cold page cache every time; a long-lived connection
+        amortizes both. Connections are per-thread because SQLite handles
+        aren't safely shareable across threads.
+        """
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            # isolation_level=None: autocommit, with explicit transactions
+            # where batching matters
+            conn = sqlite3.connect(self.db_path, isolation_level=None,
+                                   cached_statements=512)
+            conn.executescript(self._TUNING_PRAGMAS)
+            # Name-based row access; also unpacks like a tuple
+            conn.row_factory = sqlite3.Row
+            self._local.conn = conn
+        return conn
+
+    def _connect_ro(self) -> sqlite3.Connection:
+        """
+        Get this thread's read-only connection, creating it on first use.
+
+        mode=ro opens the file with SQLITE_OPEN_READONLY; under WAL,
+        reads on this handle proceed concurrently with an in-flight
+        write transaction on the writer handle, so the UI can list
+        sessions or pull statistics while a recording batch commits.
+        """
+        conn = getattr(self._local, 'ro_conn', None)
+        if conn is None:
+            conn = sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True,
+                                   isolation_level=None, cached_statements=512)
+            conn.executescript(self._RO_TUNING_PRAGMAS)
+            conn.row_factory = sqlite3.Row
+            self._local.ro_conn = conn
+        return conn
+
+    def _flush_loop(self):
+        """
+        Flush buffered rows on a fixed interval until close().
+
+        A single long-lived daemon thread (with its own per-thread
+        connection) rather than a threading.Timer chain, which would
+        spawn a fresh thread - and a fresh connection - per tick. Wakes
+        early when a buffer hits _FLUSH_THRESHOLD.
+        """
+        while not self._stop_flushing.is_set():
+            self._flush_wakeup.wait(self._FLUSH_INTERVAL_SECONDS)
+            self._flush_wakeup.clear()
+            if self._stop_flushing.is_set():
+                break
+            try:
+                self.flush()
+            except sqlite3.Error:
+                # Rows stay buffered; the next tick or close() retries
+                pass
+
+    def flush(self):
+        """
+        Write all buffered single-row inserts in one transaction.
+
+        Called automatically when a buffer reaches _FLUSH_THRESHOLD and
+        from close(); call it explicitly at session end to make sure the
+        last partial buffers reach disk.
+        """
+        with self._buffer_lock:
+            events, self._event_buffer = self._event_buffer, []
+            frames, self._frame_buffer = self._frame_buffer, []
+            health, self._health_buffer = self._health_buffer, []
+
+        if not (events or frames or health):
+            return
+
+        cursor = self._connect().cursor()
+        cursor.execute("BEGIN IMMEDIATE")
+        try:
+            if events:
+                cursor.executemany(self._INSERT_EVENT_SQL, events)
+            if frames:
+                cursor.executemany(self._INSERT_FRAME_SQL, frames)
+            if health:
+                cursor.executemany(self._INSERT_HEALTH_SQL, health)
+            cursor.execute("COMMIT")
+        except Exception:
+            cursor.execute("ROLLBACK")
+            # Put the rows back so a failed flush loses nothing; a later
+            # flush (or close()) retries them
+            with self._buffer_lock:
+                self._event_buffer[:0] = events
+                self._frame_buffer[:0] = frames
+                self._health_buffer[:0] = health
+            raise
+
+    @contextmanager
+    def bulk_import_mode(self):
+        """
+        Drop the input_events covering index around a bulk load.
+
+        Index maintenance is O(log N) write amplification per inserted
+        row; for historical imports touching millions of events, one
+        index build over the final data is materially cheaper. The index
+        and fresh statistics are restored even if the load raises.
+
+        Usage:
+            with db.bulk_import_mode():
+                db.add_input_events_batch(events)
+        """
+        conn = self._connect()
+        conn.execute("DROP INDEX IF EXISTS idx_events_covering")
+        try:
+            yield
+        finally:
+            conn.execute(DatabaseSchema.CREATE_INPUT_EVENTS_COVERING_INDEX)
+            conn.execute("ANALYZE input_events")
+
+    def maintenance(self):
+        """
+        Compact the WAL and refresh query-planner statistics.
+
+        Under sustained ingest the WAL grows without bound until a
+        checkpoint truncates it; planner statistics also drift as tables
+        grow. Run after a session completes or a large delete.
+        """
+        conn = self._connect()
+        try:
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            conn.execute("PRAGMA optimize")
+        except sqlite3.Error:
+            pass
+
+    def close(self):
+        """
+        Close this thread's connections.
+
+        Stops the background flush thread, flushes any buffered rows,
+        and runs the WAL/statistics maintenance before closing.
+        """
+        self._stop_flushing.set()
+        self._flush_wakeup.set()
+        self.flush()
+        ro_conn = getattr(self._local, 'ro_conn', None)
+        if ro_conn is not None:
+            ro_conn.close()
+            self._local.ro_conn = None
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            self.maintenance()
+            conn.close()
+            self._local.conn = None
+
+    @staticmethod
+    def _insert_multirow(cursor, insert_prefix, num_columns, rows):
+        """
+        Insert rows using multi-row VALUES statements.
+
+        executemany prepares once but still runs the bytecode interpreter
+        per row; packing as many rows per statement as SQLite's 999
+        bound-parameter limit allows cuts that per-row overhead on large
+        batches. A second statement sized to the remainder picks up the
+        leftover rows.
+
+        Args:
+            cursor: Cursor of an open transaction
+            insert_prefix: "INSERT INTO table (cols...)" without VALUES
+            num_columns: Number of columns per row
+            rows: Sequence of parameter tuples
+        """
+        rows_per_stmt = 999 // num_columns
+        group = "(" + ", ".join("?" * num_columns) + ")"
+        full_sql = insert_prefix + " VALUES " + ",".join([group] * rows_per_stmt)
+
+        full_count = len(rows) // rows_per_stmt * rows_per_stmt
+        for start in range(0, full_count, rows_per_stmt):
+            chunk = rows[start:start + rows_per_stmt]
+            cursor.execute(full_sql, tuple(chain.from_iterable(chunk)))
+
+        leftover = rows[full_count:]
+        if leftover:
+            sql = insert_prefix + " VALUES " + ",".join([group] * len(leftover))
+            cursor.execute(sql, tuple(chain.from_iterable(leftover)))
+
     def _ensure_database_exists(self):
         """Create database and tables if they don't exist."""
         # Create directory if it doesn't exist
         db_dir = os.path.dirname(self.db_path)
         if db_dir:
             os.makedirs(db_dir, exist_ok=True)
-        
-        # Create tables
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            for schema in DatabaseSchema.get_all_schemas():
-                cursor.execute(schema)
-            conn.commit()
-    
+
+        # The stats table is the newest schema object, so its absence
+        # marks a database that hasn't been opened with this schema yet.
+        # The one-off seed scan and ANALYZE below only make sense then;
+        # running them every launch would pay two O(N) passes over
+        # input_events at startup.
+        cursor = self._connect().cursor()
+        cursor.execute(
+            "SELECT COUNT(*) FROM sqlite_master "
+            "WHERE type = 'table' AND name = 'stats'"
+        )
+        is_current = cursor.fetchone()[0] > 0
+
+        for schema in DatabaseSchema.get_all_schemas():
+            cursor.execute(schema)
+
+        # input_events is read exclusively by (session_id, timestamp_ms);
+        # idx_events_covering already serves those reads as index-only
+        # scans, so the old narrower indexes were pure insert overhead
+        cursor.execute("DROP INDEX IF EXISTS idx_session_events")
+        cursor.execute("DROP INDEX IF EXISTS idx_timestamp")
+
+        if not is_current:
+            # Seed the counter row from the real count exactly once; the
+            # triggers keep it current from here on
+            cursor.execute(
+                "INSERT OR IGNORE INTO stats (id, total_events) "
+                "VALUES (1, (SELECT COUNT(*) FROM input_events))"
+            )
+
+            # Refresh planner statistics so the new compound indexes are
+            # actually chosen over full scans; afterwards maintenance()'s
+            # PRAGMA optimize keeps them fresh
+            cursor.execute("ANALYZE")
+
     # ========================================
     # Session Methods
     # ========================================
-    
+
     def create_session(self, session: Session) -> int:
         """
         Create a new recording session.
-        
+
         Args:
             session: Session object to create
-            
+
         Returns:
             Session ID
         """
-        query = """
-        INSERT INTO sessions (
-            game_name, start_time, end_time, duration_seconds,
-            video_path, system_audio_path, microphone_audio_path,
-            input_type, fps, latency_offset_ms, status, monitor_index, notes,
-            video_width, video_height, video_codec, total_frames, file_size_bytes
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """
-        
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute(query, (
-                session.game_name,
-                session.start_time.isoformat() if session.start_time else None,
-                session.end_time.isoformat() if session.end_time else None,
-                session.duration_seconds,
-                session.video_path,
-                session.system_audio_path,
-                session.microphone_audio_path,
-                session.input_type,
-                session.fps,
-                session.latency_offset_ms,
-                session.status,
-                session.monitor_index,
-                session.notes,
-                session.video_width,
-                session.video_height,
-                session.video_codec,
-                session.total_frames,
-                session.file_size_bytes
-            ))
-            conn.commit()
-            return cursor.lastrowid
-    
+        # RETURNING hands back the new id in the same statement step;
+        # lastrowid is connection-global state and goes stale if another
+        # thread inserts between the execute and the read
+        cursor = self._connect().cursor()
+        cursor.execute(self._INSERT_SESSION_SQL, _session_to_row(session))
+        return cursor.fetchone()[0]
+
     def update_session(self, session: Session):
         """
         Update an existing session.
-        
+
         Args:
             session: Session object with updated data
         """
-        query = """
-        UPDATE sessions SET
-            game_name = ?,
-            start_time = ?,
-            end_time = ?,
-            duration_seconds = ?,
-            video_path = ?,
-            system_audio_path = ?,
-            microphone_audio_path = ?,
-            input_type = ?,
-            fps = ?,
-            latency_offset_ms = ?,
-            status = ?,
-            monitor_index = ?,
-            notes = ?,
-            video_width = ?,
-            video_height = ?,
-            video_codec = ?,
-            total_frames = ?,
-            file_size_bytes = ?
-        WHERE id = ?
-        """
-        
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute(query, (
-                session.game_name,
-                session.start_time.isoformat() if session.start_time else None,
-                session.end_time.isoformat() if session.end_time else None,
-                session.duration_seconds,
-                session.video_path,
-                session.system_audio_path,
-                session.microphone_audio_path,
-                session.input_type,
-                session.fps,
-                session.latency_offset_ms,
-                session.status,
-                session.monitor_index,
-                session.notes,
-                session.video_width,
-                session.video_height,
-                session.video_codec,
-                session.total_frames,
-                session.file_size_bytes,
-                session.id
-            ))
-            conn.commit()
-    
+        cursor = self._connect().cursor()
+        cursor.execute(self._UPDATE_SESSION_SQL,
+                       _session_to_row(session) + (session.id,))
+
+    def upsert_session(self, session: Session) -> int:
+        """
+        Insert a session, or update it in place if its id already exists.
+
+        One atomic statement replaces the get_session-then-update_session
+        round trip in recovery paths. A session without an id is inserted
+        and assigned one (a NULL id never conflicts).
+
+        Args:
+            session: Session object to write
+
+        Returns:
+            Session ID
+        """
+        cursor = self._connect().cursor()
+        cursor.execute(self._UPSERT_SESSION_SQL,
+                       (session.id,) + _session_to_row(session))
+        session.id = cursor.fetchone()[0]
+        return session.id
+
     def get_session(self, session_id: int) -> Optional[Session]:
         """
         Get a session by ID.
-        
+
         Args:
             session_id: ID of session to retrieve
-            
+
         Returns:
             Session object or None if not found
         """
-        query = "SELECT * FROM sessions WHERE id = ?"
-        
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute(query, (session_id,))
-            row = cursor.fetchone()
-            
-            if row:
-                return Session.from_db_row(row)
-            return None
-    
+        cursor = self._connect_ro().cursor()
+        cursor.execute(self._SELECT_SESSION_SQL, (session_id,))
+        row = cursor.fetchone()
+
+        if row:
+            return Session.from_db_row(row)
+        return None
+
     def get_sessions_by_game(self, game_name: str) -> List[Session]:
         """
         Get all sessions for a specific game.
-        
+
         Args:
             game_name: Name of the game
-            
+
         Returns:
             List of Session objects
         """
-        query = "SELECT * FROM sessions WHERE game_name = ? ORDER BY start_time DESC"
-        
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute(query, (game_name,))
-            rows = cursor.fetchall()
-            
-            return [Session.from_db_row(row) for row in rows]
-    
+        cursor = self._connect_ro().cursor()
+        cursor.execute(self._SELECT_SESSIONS_BY_GAME_SQL, (game_name,))
+        rows = cursor.fetchall()
+
+        return [Session.from_db_row(row) for row in rows]
+
     def get_all_sessions(self, limit: Optional[int] = None) -> List[Session]:
         """
         Get all sessions.
-        
+
         Args:
             limit: Maximum number of sessions to return
-            
+
         Returns:
             List of Session objects
         """
-        query = "SELECT * FROM sessions ORDER BY start_time DESC"
-        if limit:
-            query += f" LIMIT {limit}"
-        
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute(query)
-            rows = cursor.fetchall()
-            
-            return [Session.from_db_row(row) for row in rows]
-    
+        # LIMIT is bound, not interpolated, so one prepared statement
+        # serves every limit value (-1 means no limit to SQLite)
+        cursor = self._connect_ro().cursor()
+        cursor.execute(self._SELECT_ALL_SESSIONS_SQL, (limit if limit else -1,))
+        rows = cursor.fetchall()
+
+        return [Session.from_db_row(row) for row in rows]
+
     def get_incomplete_sessions(self) -> List[Session]:
         """
         Get sessions that didn't complete properly.
-        
+
         Returns:
             List of incomplete Session objects
         """
-        query = "SELECT * FROM sessions WHERE status = 'recording' OR end_time IS NULL"
-        
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute(query)
-            rows = cursor.fetchall()
-            return [Session.from_db_row(row) for row in rows]
-    
+        cursor = self._connect_ro().cursor()
+        cursor.execute(self._SELECT_INCOMPLETE_SESSIONS_SQL)
+        rows = cursor.fetchall()
+        return [Session.from_db_row(row) for row in rows]
+
     def mark_session_failed(self, session_id: int, error: str):
         """
         Mark a session as failed.
-        
+
         Args:
             session_id: ID of the session
             error: Error message to store
         """
         query = "UPDATE sessions SET status = 'failed', notes = ? WHERE id = ?"
-        
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute(query, (error, session_id))
-            conn.commit()
-    
+
+        cursor = self._connect().cursor()
+        cursor.execute(query, (error, session_id))
+
     def delete_session(self, session_id: int):
         """
         Delete a session and all its related data.
-        
+
         Args:
             session_id: ID of session to delete
         """
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            # These will cascade due to foreign keys
-            cursor.execute("DELETE FROM sessions WHERE id = ?", (session_id,))
-            conn.commit()
-    
+        # One autocommit statement, one transaction: the ON DELETE
+        # CASCADE foreign keys (enforced via PRAGMA foreign_keys=ON in
+        # _TUNING_PRAGMAS) remove the input_events, frame_timestamps,
+        # and session_health children inside the same commit
+        cursor = self._connect().cursor()
+        cursor.execute("DELETE FROM sessions WHERE id = ?", (session_id,))
+
+        # Deletes free a lot of WAL pages at once; reclaim them now
+        self.maintenance()
+
     # ========================================
     # Action Code Methods
     # ========================================
-    
+
     def get_or_create_action_code(
-        self, 
-        input_device: str, 
+        self,
+        input_device: str,
         raw_input: str,
         description: Optional[str] = None,
         category: Optional[str] = None
     ) -> int:
         """
         Get existing action code or create new one.
-        
+
         Args:
             input_device: Device type (keyboard, mouse, xbox, playstation)
             raw_input: Raw input identifier (key name, button code)
             description: Human-readable description (optional)
             category: Category (movement, attack, action, special) (optional)
-            
+
         Returns:
             Action code ID
         """
         cache_key = f"{input_device}:{raw_input}"
-        
+
         # Check cache first
         if cache_key in self._action_code_cache:
             return self._action_code_cache[cache_key]
-        
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            
-            # Try to find existing
-            cursor.execute(
-                "SELECT id FROM action_codes WHERE input_device = ? AND raw_input = ?",
-                (input_device, raw_input)
-            )
-            row = cursor.fetchone()
-            
-            if row:
-                action_code_id = row[0]
-            else:
-                # Create new - get next encoded value for this device
-                cursor.execute(
-                    "SELECT MAX(encoded_value) FROM action_codes WHERE input_device = ?",
-                    (input_device,)
-                )
-                max_val = cursor.fetchone()[0]
-                encoded_value = (max_val + 1) if max_val is not None else 0
-                
-                cursor.execute(
-                    """INSERT INTO action_codes (input_device, raw_input, encoded_value, description, category)
-                       VALUES (?, ?, ?, ?, ?)""",
-                    (input_device, raw_input, encoded_value, description, category)
-                )
-                conn.commit()
-                action_code_id = cursor.lastrowid
-            
-            # Cache it
-            self._action_code_cache[cache_key] = action_code_id
-            return action_code_id
-    
+
+        # Single compound statement on the miss path: computes the next
+        # per-device encoded value, inserts (the no-op DO UPDATE makes
+        # RETURNING fire even if another process created the row first),
+        # and hands back the id - one statement instead of three
+        query = """
+        INSERT INTO action_codes (input_device, raw_input, encoded_value, description, category)
+        SELECT ?, ?, COALESCE((SELECT MAX(encoded_value) + 1 FROM action_codes WHERE input_device = ?), 0), ?, ?
+        ON CONFLICT(input_device, raw_input) DO UPDATE SET id = id
+        RETURNING id
+        """
+
+        cursor = self._connect().cursor()
+        cursor.execute(query, (input_device, raw_input, input_device, description, category))
+        action_code_id = cursor.fetchone()[0]
+
+        # Cache it
+        self._action_code_cache[cache_key] = action_code_id
+        return action_code_id
+
+    def _resolve_action_codes_bulk(self, cursor, pairs):
+        """
+        Populate the action code cache for a set of (device, button) pairs.
+
+        Runs inside the caller's transaction using set-based statements:
+        one SELECT to learn existing codes, one grouped MAX for per-device
+        numbering, one executemany for the inserts, and one re-SELECT to
+        pick up the new row ids.
+
+        Args:
+            cursor: Cursor of an open write transaction
+            pairs: Iterable of (input_device, raw_input) tuples
+        """
+        cursor.execute("SELECT input_device, raw_input, id FROM action_codes")
+        for device, raw, code_id in cursor.fetchall():
+            self._action_code_cache[f"{device}:{raw}"] = code_id
+
+        missing = [
+            (device, raw) for device, raw in pairs
+            if f"{device}:{raw}" not in self._action_code_cache
+        ]
+        if not missing:
+            return
+
+        # Next encoded value per device, assigned in Python
+        cursor.execute(
+            "SELECT input_device, MAX(encoded_value) FROM action_codes GROUP BY input_device"
+        )
+        next_value = {device: max_val + 1 for device, max_val in cursor.fetchall()}
+
+        rows = []
+        for device, raw in missing:
+            value = next_value.get(device, 0)
+            next_value[device] = value + 1
+            rows.append((device, raw, value))
+
+        cursor.executemany(
+            "INSERT INTO action_codes (input_device, raw_input, encoded_value) VALUES (?, ?, ?)",
+            rows
+        )
+
+        # executemany doesn't report row ids; re-read to cache them
+        cursor.execute("SELECT input_device, raw_input, id FROM action_codes")
+        for device, raw, code_id in cursor.fetchall():
+            self._action_code_cache[f"{device}:{raw}"] = code_id
+
     def get_action_mapping(self, input_device: Optional[str] = None) -> Dict[str, int]:
         """
         Get action code mapping for ML training.
-        
+
         Args:
             input_device: Filter by device type (None = all devices)
-            
+
         Returns:
             Dictionary mapping "device:button" to encoded value
         """
         query = "SELECT input_device, raw_input, encoded_value FROM action_codes"
         params = []
-        
+
         if input_device:
             query += " WHERE input_device = ?"
             params.append(input_device)
-        
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute(query, params)
-            
-            mapping = {}
-            for device, raw, encoded in cursor.fetchall():
-                key = f"{device}:{raw}"
-                mapping[key] = encoded
-            
-            return mapping
-    
+
+        cursor = self._connect_ro().cursor()
+        cursor.execute(query, params)
+
+        mapping = {}
+        for device, raw, encoded in cursor.fetchall():
+            key = f"{device}:{raw}"
+            mapping[key] = encoded
+
+        return mapping
+
     # ========================================
     # Input Event Methods
     # ========================================
-    
+
     def add_input_event(self, event: InputEvent):
         """
         Add an input event to the database.
         Automatically creates action code if needed.
-        
+
+        The row is buffered and written with the next flush() so a burst
+        of single events costs one transaction, not one commit each.
+
         Args:
             event: InputEvent object to add
         """
@@ -354,17 +822,9 @@ class DatabaseManager:
             event.input_device,
             event.button_key
         )
-        
-        query = """
-        INSERT INTO input_events (
-            session_id, timestamp_ms, input_device, button_key,
-            action, value, x_position, y_position, action_code
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """
-        
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute(query, (
+
+        with self._buffer_lock:
+            self._event_buffer.append((
                 event.session_id,
                 event.timestamp_ms,
                 event.input_device,
@@ -375,35 +835,43 @@ class DatabaseManager:
                 event.y_position,
                 action_code
             ))
-            conn.commit()
-    
+            should_flush = len(self._event_buffer) >= self._FLUSH_THRESHOLD
+
+        if should_flush:
+            self._flush_wakeup.set()
+
     def add_input_events_batch(self, events: List[InputEvent]):
         """
         Add multiple input events in a batch (faster).
         Automatically creates action codes if needed.
-        
+
         Args:
             events: List of InputEvent objects
         """
-        query = """
+        insert_prefix = """
         INSERT INTO input_events (
             session_id, timestamp_ms, input_device, button_key,
             action, value, x_position, y_position, action_code
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """
-        
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            
-            data = []
-            for event in events:
-                # Get or create action code for each event
-                action_code = self.get_or_create_action_code(
-                    event.input_device,
-                    event.button_key
-                )
-                
-                data.append((
+        )"""
+
+        if not events:
+            return
+
+        cursor = self._connect().cursor()
+
+        # One write transaction for the whole batch; action codes are
+        # resolved with a few set-based statements instead of a
+        # get_or_create round-trip per event
+        cursor.execute("BEGIN IMMEDIATE")
+        try:
+            pairs = {(e.input_device, e.button_key) for e in events}
+            if any(f"{device}:{raw}" not in self._action_code_cache
+                   for device, raw in pairs):
+                self._resolve_action_codes_bulk(cursor, pairs)
+
+            cache = self._action_code_cache
+            data = [
+                (
                     event.session_id,
                     event.timestamp_ms,
                     event.input_device,
@@ -412,45 +880,131 @@ class DatabaseManager:
                     event.value,
                     event.x_position,
                     event.y_position,
-                    action_code
-                ))
-            
-            cursor.executemany(query, data)
-            conn.commit()
-    
+                    cache[f"{event.input_device}:{event.button_key}"]
+                )
+                for event in events
+            ]
+
+            self._insert_multirow(cursor, insert_prefix, 9, data)
+            cursor.execute("COMMIT")
+        except Exception:
+            cursor.execute("ROLLBACK")
+            raise
+
+    @staticmethod
+    def _event_from_row(row: sqlite3.Row) -> InputEvent:
+        """Build an InputEvent from a named row."""
+        return InputEvent(
+            event_id=row["id"],
+            session_id=row["session_id"],
+            timestamp_ms=row["timestamp_ms"],
+            input_device=row["input_device"],
+            button_key=row["button_key"],
+            action=row["action"],
+            value=row["value"],
+            x_position=row["x_position"],
+            y_position=row["y_position"],
+            action_code=row["action_code"]
+        )
+
     def get_input_events(self, session_id: int) -> List[InputEvent]:
         """
         Get all input events for a session.
-        
+
         Args:
             session_id: ID of the session
-            
+
         Returns:
             List of InputEvent objects
         """
-        query = "SELECT * FROM input_events WHERE session_id = ? ORDER BY timestamp_ms"
-        
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute(query, (session_id,))
-            rows = cursor.fetchall()
-            
-            return [
-                InputEvent(
-                    event_id=row[0],
-                    session_id=row[1],
-                    timestamp_ms=row[2],
-                    input_device=row[3],
-                    button_key=row[4],
-                    action=row[5],
-                    value=row[6],
-                    x_position=row[7],
-                    y_position=row[8],
-                    action_code=row[9] if len(row) > 9 else None
+        return list(self.iter_input_events(session_id))
+
+    def iter_input_events(self, session_id: int) -> Iterator[InputEvent]:
+        """
+        Stream a session's input events one at a time.
+
+        Generator counterpart to get_input_events: iterates the cursor
+        directly instead of fetchall(), so only one row is resident at a
+        time. Useful for export pipelines over long sessions.
+
+        Args:
+            session_id: ID of the session
+
+        Yields:
+            InputEvent objects in timestamp order
+        """
+        cursor = self._connect_ro().cursor()
+        cursor.execute(self._SELECT_EVENTS_SQL, (session_id,))
+        for row in cursor:
+            yield self._event_from_row(row)
+
+    def get_input_events_array(self, session_id: int):
+        """
+        Read a session's input events into a NumPy structured array.
+
+        For million-event sessions the InputEvent object layer is pure
+        overhead for ML consumers: ~400 bytes per Python object versus
+        ~80 bytes per packed record. Each field of the result is a
+        contiguous column (arr['timestamp_ms'] is a plain int64 vector),
+        so training pipelines index straight into the buffers.
+
+        NULL value/position columns come back as NaN, NULL text columns
+        as empty bytes, and a missing action_code as -1.
+
+        Args:
+            session_id: ID of the session
+
+        Returns:
+            np.ndarray of event records in timestamp order
+        """
+        import numpy as np  # Deferred: only the ML read path needs it
+
+        dtype = np.dtype([
+            ('event_id', 'i8'), ('session_id', 'i4'),
+            ('timestamp_ms', 'i8'), ('input_device', 'S16'),
+            ('button_key', 'S32'), ('action', 'S8'),
+            ('value', 'f4'), ('x_position', 'f4'), ('y_position', 'f4'),
+            ('action_code', 'i4')
+        ])
+
+        cursor = self._connect_ro().cursor()
+        cursor.execute(
+            "SELECT COUNT(*) FROM input_events WHERE session_id = ?",
+            (session_id,)
+        )
+        count = cursor.fetchone()[0]
+
+        arr = np.empty(count, dtype)
+        cursor.execute(self._SELECT_EVENTS_SQL, (session_id,))
+        cursor.arraysize = 10_000
+
+        nan = float('nan')
+        filled = 0
+        while filled < count:
+            rows = cursor.fetchmany()
+            if not rows:
+                break
+            # The COUNT and this scan are separate statements, each with
+            # its own WAL snapshot; clamp so events committed in between
+            # (exporting while recording) can't overflow the array
+            rows = rows[:count - filled]
+            arr[filled:filled + len(rows)] = [
+                (
+                    row[0], row[1], row[2],
+                    row[3] or '', row[4] or '', row[5] or '',
+                    nan if row[6] is None else row[6],
+                    nan if row[7] is None else row[7],
+                    nan if row[8] is None else row[8],
+                    -1 if row[9] is None else row[9]
                 )
                 for row in rows
             ]
-    
+            filled += len(rows)
+
+        # Trim in case rows disappeared between the COUNT and the scan;
+        # the tail of np.empty would otherwise be uninitialized garbage
+        return arr[:filled]
+
     def get_input_events_batch(
         self,
         session_id: int,
@@ -460,177 +1014,156 @@ class DatabaseManager:
     ) -> List[InputEvent]:
         """
         Get input events for a specific frame range.
-        
+
         Args:
             session_id: ID of the session
             start_frame: Starting frame number
             end_frame: Ending frame number
             fps: Frames per second of the video
-            
+
         Returns:
             List of InputEvent objects in the frame range
         """
-        start_ms = int((start_frame / fps) * 1000)
-        end_ms = int((end_frame / fps) * 1000)
-        
-        query = """
-            SELECT * FROM input_events 
-            WHERE session_id = ? AND timestamp_ms BETWEEN ? AND ?
+        # Frame-to-ms conversion happens in the VDBE with bound fps, so
+        # a training loop calling this per frame reuses one cached plan
+        # with no Python-side float churn
+        query = f"""
+            SELECT {INPUT_EVENT_COLS} FROM input_events
+            WHERE session_id = ?
+              AND timestamp_ms BETWEEN CAST(? * 1000.0 / ? AS INTEGER)
+                                   AND CAST(? * 1000.0 / ? AS INTEGER)
             ORDER BY timestamp_ms
         """
-        
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute(query, (session_id, start_ms, end_ms))
-            rows = cursor.fetchall()
-            
-            return [
-                InputEvent(
-                    event_id=row[0],
-                    session_id=row[1],
-                    timestamp_ms=row[2],
-                    input_device=row[3],
-                    button_key=row[4],
-                    action=row[5],
-                    value=row[6],
-                    x_position=row[7],
-                    y_position=row[8],
-                    action_code=row[9] if len(row) > 9 else None
-                )
-                for row in rows
-            ]
-    
+
+        cursor = self._connect_ro().cursor()
+        cursor.execute(query, (session_id, start_frame, fps, end_frame, fps))
+        return [self._event_from_row(row) for row in cursor]
+
     # ========================================
     # Frame Timing Methods
     # ========================================
-    
+
     def add_frame_timestamp(self, frame: FrameTimestamp):
         """
         Add a frame timestamp record.
-        
+
+        Buffered; written with the next flush().
+
         Args:
             frame: FrameTimestamp object
         """
-        query = """
-        INSERT INTO frame_timestamps (
-            session_id, frame_number, capture_timestamp_ms, 
-            write_timestamp_ms, dropped
-        ) VALUES (?, ?, ?, ?, ?)
-        """
-        
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute(query, (
+        with self._buffer_lock:
+            self._frame_buffer.append((
                 frame.session_id,
                 frame.frame_number,
                 frame.capture_timestamp_ms,
                 frame.write_timestamp_ms,
                 frame.dropped
             ))
-            conn.commit()
-    
+            should_flush = len(self._frame_buffer) >= self._FLUSH_THRESHOLD
+
+        if should_flush:
+            self._flush_wakeup.set()
+
     def add_frame_timestamps_batch(self, frames: List[FrameTimestamp]):
         """
         Add multiple frame timestamps in batch.
-        
+
         Args:
             frames: List of FrameTimestamp objects
         """
-        query = """
+        insert_prefix = """
         INSERT INTO frame_timestamps (
             session_id, frame_number, capture_timestamp_ms,
             write_timestamp_ms, dropped
-        ) VALUES (?, ?, ?, ?, ?)
-        """
-        
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.executemany(query, [
-                (f.session_id, f.frame_number, f.capture_timestamp_ms,
-                 f.write_timestamp_ms, f.dropped)
-                for f in frames
-            ])
-            conn.commit()
-    
+        )"""
+
+        if not frames:
+            return
+
+        data = [
+            (f.session_id, f.frame_number, f.capture_timestamp_ms,
+             f.write_timestamp_ms, f.dropped)
+            for f in frames
+        ]
+
+        cursor = self._connect().cursor()
+        cursor.execute("BEGIN IMMEDIATE")
+        try:
+            self._insert_multirow(cursor, insert_prefix, 5, data)
+            cursor.execute("COMMIT")
+        except Exception:
+            cursor.execute("ROLLBACK")
+            raise
+
     # ========================================
     # Session Health Methods
     # ========================================
-    
+
     def add_health_check(self, health: SessionHealth):
         """
         Add a session health check record.
-        
+
+        Buffered; written with the next flush().
+
         Args:
             health: SessionHealth object
         """
-        query = """
-        INSERT INTO session_health (
-            session_id, check_time, disk_space_gb, cpu_percent,
-            memory_mb, frames_captured, frames_dropped
-        ) VALUES (?, ?, ?, ?, ?, ?, ?)
-        """
-        
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute(query, (
+        with self._buffer_lock:
+            self._health_buffer.append((
                 health.session_id,
-                health.check_time.isoformat(),
+                _iso(health.check_time),
                 health.disk_space_gb,
                 health.cpu_percent,
                 health.memory_mb,
                 health.frames_captured,
                 health.frames_dropped
             ))
-            conn.commit()
-    
+            should_flush = len(self._health_buffer) >= self._FLUSH_THRESHOLD
+
+        if should_flush:
+            self._flush_wakeup.set()
+
     # ========================================
     # Statistics and Utilities
     # ========================================
-    
+
     def get_statistics(self) -> dict:
         """
         Get database statistics.
-        
+
         Returns:
             Dictionary with statistics
         """
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            
-            # Total sessions
-            cursor.execute("SELECT COUNT(*) FROM sessions")
-            total_sessions = cursor.fetchone()[0]
-            
-            # Completed sessions
-            cursor.execute("SELECT COUNT(*) FROM sessions WHERE status = 'completed'")
-            completed_sessions = cursor.fetchone()[0]
-            
-            # Total recording time
-            cursor.execute("SELECT SUM(duration_seconds) FROM sessions WHERE duration_seconds IS NOT NULL")
-            total_duration = cursor.fetchone()[0] or 0
-            
-            # Total input events
-            cursor.execute("SELECT COUNT(*) FROM input_events")
-            total_events = cursor.fetchone()[0]
-            
-            # Games recorded
-            cursor.execute("SELECT COUNT(DISTINCT game_name) FROM sessions")
-            unique_games = cursor.fetchone()[0]
-            
-            # Total frames
-            cursor.execute("SELECT SUM(total_frames) FROM sessions WHERE total_frames IS NOT NULL")
-            total_frames = cursor.fetchone()[0] or 0
-            
-            # Total storage
-            cursor.execute("SELECT SUM(file_size_bytes) FROM sessions WHERE file_size_bytes IS NOT NULL")
-            total_bytes = cursor.fetchone()[0] or 0
-            
-            return {
-                'total_sessions': total_sessions,
-                'completed_sessions': completed_sessions,
-                'total_duration_seconds': total_duration,
-                'total_input_events': total_events,
-                'unique_games': unique_games,
-                'total_frames': total_frames,
-                'total_storage_gb': total_bytes / (1024**3) if total_bytes else 0
-            }
\ No newline at end of file
+        cursor = self._connect_ro().cursor()
+
+        # All six session aggregates in one table scan; SUM already
+        # skips NULLs, COALESCE covers the empty-table case
+        cursor.execute("""
+            SELECT
+                COUNT(*),
+                COALESCE(SUM(CASE WHEN status = 'completed' THEN 1 ELSE 0 END), 0),
+                COALESCE(SUM(duration_seconds), 0),
+                COUNT(DISTINCT game_name),
+                COALESCE(SUM(total_frames), 0),
+                COALESCE(SUM(file_size_bytes), 0)
+            FROM sessions
+        """)
+        (total_sessions, completed_sessions, total_duration,
+         unique_games, total_frames, total_bytes) = cursor.fetchone()
+
+        # Trigger-maintained counter: O(1) however many events exist,
+        # where COUNT(*) walks the whole input_events B-tree
+        cursor.execute("SELECT total_events FROM stats WHERE id = 1")
+        row = cursor.fetchone()
+        total_events = row[0] if row else 0
+
+        return {
+            'total_sessions': total_sessions,
+            'completed_sessions': completed_sessions,
+            'total_duration_seconds': total_duration,
+            'total_input_events': total_events,
+            'unique_games': unique_games,
+            'total_frames': total_frames,
+            'total_storage_gb': total_bytes / (1024**3) if total_bytes else 0
+        }
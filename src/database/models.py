@@ -45,6 +45,20 @@ class DatabaseSchema:
     CREATE_SESSIONS_STATUS_INDEX = """
     CREATE INDEX IF NOT EXISTS idx_status ON sessions(status);
     """
+
+    # Matches get_sessions_by_game's WHERE game_name = ? ORDER BY
+    # start_time DESC exactly, so rows come back in index order
+    CREATE_SESSIONS_GAME_START_INDEX = """
+    CREATE INDEX IF NOT EXISTS idx_sessions_game_start ON sessions(game_name, start_time DESC);
+    """
+
+    # Partial index for crash recovery: only unfinished sessions are
+    # indexed, so get_incomplete_sessions stays O(matches) however many
+    # completed sessions accumulate
+    CREATE_SESSIONS_INCOMPLETE_INDEX = """
+    CREATE INDEX IF NOT EXISTS idx_incomplete ON sessions(id)
+        WHERE status = 'recording' OR end_time IS NULL;
+    """
     
     CREATE_INPUT_EVENTS_TABLE = """
     CREATE TABLE IF NOT EXISTS input_events (
@@ -63,12 +77,17 @@ class DatabaseSchema:
     );
     """
     
-    CREATE_INPUT_EVENTS_INDEX = """
-    CREATE INDEX IF NOT EXISTS idx_session_events ON input_events(session_id, timestamp_ms);
-    """
-    
-    CREATE_INPUT_EVENTS_TIMESTAMP_INDEX = """
-    CREATE INDEX IF NOT EXISTS idx_timestamp ON input_events(timestamp_ms);
+    # Covering index: keyed on (session_id, timestamp_ms) with the
+    # remaining projected columns appended, so per-session event reads
+    # are satisfied by an index-only scan in query order (id rides along
+    # as the rowid). This is the clustering structure for input_events;
+    # narrower indexes on the same key prefix only add per-insert
+    # maintenance and are dropped on upgrade.
+    CREATE_INPUT_EVENTS_COVERING_INDEX = """
+    CREATE INDEX IF NOT EXISTS idx_events_covering ON input_events(
+        session_id, timestamp_ms, input_device, button_key, action,
+        value, x_position, y_position, action_code
+    );
     """
     
     CREATE_ACTION_CODES_TABLE = """
@@ -100,6 +119,33 @@ class DatabaseSchema:
     CREATE INDEX IF NOT EXISTS idx_frame_timing ON frame_timestamps(session_id, frame_number);
     """
     
+    # Singleton counter row so get_statistics never has to COUNT(*) the
+    # input_events table (O(N) B-tree walk in SQLite). Maintained by the
+    # triggers below; seeded from the real count at schema setup.
+    # Session aggregates stay as a direct scan - sessions is small.
+    CREATE_STATS_TABLE = """
+    CREATE TABLE IF NOT EXISTS stats (
+        id INTEGER PRIMARY KEY CHECK (id = 1),
+        total_events INTEGER NOT NULL DEFAULT 0
+    );
+    """
+
+    CREATE_EVENTS_INSERT_TRIGGER = """
+    CREATE TRIGGER IF NOT EXISTS trg_events_count_insert
+        AFTER INSERT ON input_events
+    BEGIN
+        UPDATE stats SET total_events = total_events + 1 WHERE id = 1;
+    END;
+    """
+
+    CREATE_EVENTS_DELETE_TRIGGER = """
+    CREATE TRIGGER IF NOT EXISTS trg_events_count_delete
+        AFTER DELETE ON input_events
+    BEGIN
+        UPDATE stats SET total_events = total_events - 1 WHERE id = 1;
+    END;
+    """
+
     CREATE_SESSION_HEALTH_TABLE = """
     CREATE TABLE IF NOT EXISTS session_health (
         id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -122,19 +168,34 @@ class DatabaseSchema:
             cls.CREATE_SESSIONS_GAME_INDEX,
             cls.CREATE_SESSIONS_TIME_INDEX,
             cls.CREATE_SESSIONS_STATUS_INDEX,
+            cls.CREATE_SESSIONS_GAME_START_INDEX,
+            cls.CREATE_SESSIONS_INCOMPLETE_INDEX,
             cls.CREATE_INPUT_EVENTS_TABLE,
-            cls.CREATE_INPUT_EVENTS_INDEX,
-            cls.CREATE_INPUT_EVENTS_TIMESTAMP_INDEX,
+            cls.CREATE_INPUT_EVENTS_COVERING_INDEX,
             cls.CREATE_ACTION_CODES_TABLE,
             cls.CREATE_FRAME_TIMESTAMPS_TABLE,
             cls.CREATE_FRAME_TIMESTAMPS_INDEX,
-            cls.CREATE_SESSION_HEALTH_TABLE
+            cls.CREATE_SESSION_HEALTH_TABLE,
+            cls.CREATE_STATS_TABLE,
+            cls.CREATE_EVENTS_INSERT_TRIGGER,
+            cls.CREATE_EVENTS_DELETE_TRIGGER
         ]
 
 
 class Session:
     """Represents a recording session."""
-    
+
+    # No per-instance __dict__: sessions and events are built one per
+    # database row, so the fixed slot layout cuts memory roughly in half
+    # and speeds up the attribute writes in __init__
+    __slots__ = (
+        'id', 'game_name', 'start_time', 'end_time', 'duration_seconds',
+        'video_path', 'system_audio_path', 'microphone_audio_path',
+        'input_type', 'fps', 'latency_offset_ms', 'monitor_index',
+        'status', 'notes', 'video_width', 'video_height', 'video_codec',
+        'total_frames', 'file_size_bytes'
+    )
+
     def __init__(
         self,
         game_name: str,
@@ -255,7 +316,12 @@ class Session:
 
 class InputEvent:
     """Represents an input event (keyboard, mouse, or gamepad)."""
-    
+
+    __slots__ = (
+        'id', 'session_id', 'timestamp_ms', 'input_device', 'button_key',
+        'action', 'value', 'x_position', 'y_position', 'action_code'
+    )
+
     def __init__(
         self,
         session_id: int,
@@ -324,7 +390,12 @@ class InputEvent:
 
 class ActionCode:
     """Represents an action code mapping for ML training."""
-    
+
+    __slots__ = (
+        'id', 'input_device', 'raw_input', 'encoded_value',
+        'description', 'category', 'created_at'
+    )
+
     def __init__(
         self,
         input_device: str,
@@ -358,7 +429,12 @@ class ActionCode:
 
 class FrameTimestamp:
     """Represents a frame timing record for A/V synchronization."""
-    
+
+    __slots__ = (
+        'id', 'session_id', 'frame_number', 'capture_timestamp_ms',
+        'write_timestamp_ms', 'dropped'
+    )
+
     def __init__(
         self,
         session_id: int,
@@ -389,7 +465,12 @@ class FrameTimestamp:
 
 class SessionHealth:
     """Represents a session health check record."""
-    
+
+    __slots__ = (
+        'id', 'session_id', 'check_time', 'disk_space_gb', 'cpu_percent',
+        'memory_mb', 'frames_captured', 'frames_dropped'
+    )
+
     def __init__(
         self,
         session_id: int,
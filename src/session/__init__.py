@@ -1,6 +1,22 @@
 """Session module for GameOn."""
+import importlib
 
-from .session_manager import SessionManager
+# Resolved lazily (PEP 562), matching the package-level pattern
+_LAZY_ATTRS = {
+    'SessionManager': '.session_manager',
+}
 
 __all__ = ['SessionManager']
 
+
+def __getattr__(name):
+    """Load public attributes on first access and cache them in globals()."""
+    try:
+        module_path = _LAZY_ATTRS[name]
+    except KeyError:
+        raise AttributeError(
+            f"module {__name__!r} has no attribute {name!r}"
+        ) from None
+    value = getattr(importlib.import_module(module_path, __name__), name)
+    globals()[name] = value
+    return value
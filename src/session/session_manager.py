@@ -280,7 +280,10 @@ class SessionManager:
                 print(f"  ✓ Saved batch {i//batch_size + 1}/{(len(event_objects)-1)//batch_size + 1}")
             
             print(f"✓ Input events saved with action codes")
-        
+
+        # Push any buffered single-row inserts to disk
+        self.db_manager.flush()
+
         # Print summary
         if self.current_session:
             print(f"\n{'='*60}")